@@ -1,6 +1,8 @@
 import os
 from functools import partial
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional, Type, Union, Callable, Tuple
+from typing import Mapping
 
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.gzip import GZipMiddleware
@@ -25,14 +27,16 @@ from .compat import WSGIApp
 from .constants import DEFAULT_CORS_CONFIG
 from .error_handlers import error_to_text
 from .errors import ServerErrorMiddleware, HTTPErrorMiddleware, HTTPError
+from .executors import Executors
+from .json_engines import JSONEngineParam, get_json_engine
 from .media import Media
 from .meta import DocsMeta
 from .recipes import RecipeBase
 from .redirection import Redirection
 from .request import Request
 from .response import Response
-from .routing import HTTPRouter, WebSocketRouter
-from .staticfiles import static
+from .routing import HTTPRouter, WebSocketRouter, MountRouter
+from .staticfiles import StaticFiles, static
 from .templates import TemplatesMixin
 
 
@@ -62,6 +66,9 @@ class API(TemplatesMixin, metaclass=DocsMeta):
     static_root (str):
         The path prefix for static assets.
         Defaults to `"static"`.
+    static_config (dict):
+        Extra options for the static files app, e.g. `cache_size`.
+        See [StaticFiles](./staticfiles.md#staticfiles).
     allowed_hosts (list of str, optional):
         A list of hosts which the server is allowed to run at.
         If the list contains `"*"`, any host is allowed.
@@ -92,6 +99,46 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         Can be one of the supported media types.
         Defaults to `"application/json"`.
         See also [Media](../guides/http/media.md).
+    media_negotiation (bool):
+        If `True`, values given to `res.media` are serialized using the
+        supported media type which best matches the request's `Accept`
+        header, falling back to `media_type`.
+        Defaults to `False`.
+        See also [Content negotiation](../guides/http/media.md#content-negotiation).
+    json_engine (str or tuple):
+        The library used to encode and decode JSON in `res.media`,
+        `req.json()` and WebSocket JSON messages.
+        Can be `"json"` (the standard library), `"orjson"`, `"ujson"`,
+        `"auto"` (the fastest one which is installed), or a custom
+        `(dumps, loads)` pair of functions.
+        Defaults to `"json"`.
+        See also [JSON engines](../guides/http/media.md#json-engines).
+    routing_engine (str):
+        Determines how URL paths are matched against routes.
+        Can be `"linear"` (try each route in turn), `"regex"` (match all
+        routes at once using a single compiled regular expression) or
+        `"trie"` (walk down a prefix tree of static path segments).
+        Defaults to `"linear"`.
+        See also [Routing engines](../guides/http/routing.md#routing-engines).
+    route_cache_size (int):
+        If given, the routers cache the routes matched for this number of
+        most recently requested URL paths.
+        Defaults to `None` (no caching).
+        See also [Caching matched routes](../guides/http/routing.md#caching-matched-routes).
+    executors (dict):
+        Settings of the thread pools in which synchronous views and hooks
+        are run, as a mapping of pool names to `max_workers` and
+        `max_queue` options. The `"default"` pool is used unless a view
+        specifies an `executor`. Settings of the `"process"` pool apply
+        to the process pool used by views with `executor="process"`.
+        Defaults to a single default pool with default settings.
+        See also [Executors](../guides/http/views.md#executors).
+    max_body_size (int):
+        The maximum size of request bodies, in bytes. Larger requests
+        are rejected with a `413 Payload Too Large` error response.
+        Can be overridden per route.
+        Defaults to `None` (no limit).
+        See also [Limiting the body size](../guides/http/requests.md#limiting-the-body-size).
     """
 
     def __init__(
@@ -99,6 +146,7 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         templates_dir: str = "templates",
         static_dir: Optional[str] = "static",
         static_root: Optional[str] = "static",
+        static_config: dict = None,
         allowed_hosts: List[str] = None,
         enable_cors: bool = False,
         cors_config: dict = None,
@@ -106,9 +154,17 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         enable_gzip: bool = False,
         gzip_min_size: int = 1024,
         media_type: Optional[str] = Media.JSON,
+        media_negotiation: bool = False,
+        json_engine: JSONEngineParam = "json",
+        routing_engine: str = "linear",
+        route_cache_size: int = None,
+        executors: Dict[str, dict] = None,
+        max_body_size: int = None,
     ):
         super().__init__(templates_dir=templates_dir)
 
+        self.max_body_size = max_body_size
+
         # Debug mode defaults to `False` but it can be set in `.run()`.
         self._debug = False
 
@@ -116,11 +172,26 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         self.asgi = self.dispatch
 
         # Mounted apps
-        self.apps: Dict[str, Any] = {}
+        self._apps: Dict[str, Any] = {}
+        self.mount_router = MountRouter()
+
+        # Thread pools for synchronous views
+        self.executors = Executors(executors)
+
+        # JSON encoding and decoding
+        self.json_engine = get_json_engine(json_engine)
 
         # Routers
-        self.http_router = HTTPRouter()
-        self.websocket_router = WebSocketRouter()
+        self.http_router = HTTPRouter(
+            engine=routing_engine,
+            cache_size=route_cache_size,
+            executors=self.executors,
+        )
+        self.websocket_router = WebSocketRouter(
+            engine=routing_engine,
+            cache_size=route_cache_size,
+            json_engine=self.json_engine,
+        )
 
         # Test client
         self.client = self.build_client()
@@ -129,10 +200,15 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         if static_dir is not None:
             if static_root is None:
                 static_root = static_dir
-            self.mount(static_root, static(static_dir))
+            static_config = {"debug": self._debug, **(static_config or {})}
+            self.mount(static_root, static(static_dir, **static_config))
 
         # Media handlers
-        self._media = Media(media_type=media_type)
+        self._media = Media(
+            media_type=media_type,
+            json_engine=self.json_engine,
+            negotiation=media_negotiation,
+        )
 
         # HTTP middleware
         self.exception_middleware = HTTPErrorMiddleware(
@@ -145,6 +221,8 @@ class API(TemplatesMixin, metaclass=DocsMeta):
 
         # Lifespan middleware
         self.lifespan_middleware = LifespanMiddleware(self.dispatch_lifespan)
+        self.on("startup", self.executors.startup)
+        self.on("shutdown", self.executors.shutdown)
 
         # ASGI middleware
         if allowed_hosts is None:
@@ -169,6 +247,9 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         self._debug = debug
         self.exception_middleware.debug = debug
         self.server_error_middleware.debug = debug
+        for app in self._apps.values():
+            if isinstance(app, StaticFiles):
+                app.debug = debug
 
     def build_client(self, **kwargs) -> TestClient:
         return TestClient(self, **kwargs)
@@ -181,16 +262,33 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         """
         return {"url_for": self.url_for}
 
+    @property
+    def apps(self) -> Mapping[str, Any]:
+        """A read-only mapping of prefixes to mounted apps.
+
+        Use `mount()` to mount an app, so that the mount router can be kept
+        up to date.
+        """
+        return MappingProxyType(self._apps)
+
     def mount(self, prefix: str, app: Union[ASGIApp, WSGIApp]):
         """Mount another WSGI or ASGI app at the given prefix.
 
+        Prefixes match whole path segments, e.g. an app mounted at `"/static"`
+        does not receive requests for `"/staticfiles"`. If prefixes overlap,
+        the longest matching prefix wins.
+
         # Parameters
         prefix (str): A path prefix where the app should be mounted, e.g. `"/myapp"`.
         app: An object implementing [WSGI](https://wsgi.readthedocs.io) or [ASGI](https://asgi.readthedocs.io) protocol.
         """
         if not prefix.startswith("/"):
             prefix = "/" + prefix
-        self.apps[prefix] = app
+        if isinstance(app, StaticFiles) and self._debug:
+            # Detect changes to static files mounted after debug was set.
+            app.debug = True
+        self._apps[prefix] = app
+        self.mount_router.add(prefix, app)
 
     def recipe(self, recipe: RecipeBase):
         recipe(self)
@@ -220,6 +318,33 @@ class API(TemplatesMixin, metaclass=DocsMeta):
     def media_handlers(self, media_handlers: dict):
         self._media.handlers = media_handlers
 
+    @property
+    def negotiable_media_types(self) -> set:
+        """The set of media types which content negotiation can pick.
+
+        The configured `media_type` can always be picked. Defaults to JSON,
+        MessagePack and CBOR. You can edit or replace this at will, e.g.
+        to negotiate a custom media handler.
+        """
+        return self._media.negotiable
+
+    @negotiable_media_types.setter
+    def negotiable_media_types(self, media_types: set):
+        self._media.negotiable = media_types
+
+    @property
+    def media_decoders(self) -> dict:
+        """The dictionary of supported media decoders.
+
+        They are used by `req.media()` to decode request bodies.
+        You can access, edit or replace this at will.
+        """
+        return self._media.decoders
+
+    @media_decoders.setter
+    def media_decoders(self, media_decoders: dict):
+        self._media.decoders = media_decoders
+
     def add_error_handler(
         self, exception_cls: Type[Exception], handler: ErrorHandler
     ):
@@ -248,7 +373,14 @@ class API(TemplatesMixin, metaclass=DocsMeta):
 
         return wrapper
 
-    def route(self, pattern: str, *, name: str = None, namespace: str = None):
+    def route(
+        self,
+        pattern: str,
+        *,
+        name: str = None,
+        namespace: str = None,
+        max_body_size: int = None,
+    ):
         """Register a new route by decorating a view.
 
         # Parameters
@@ -264,12 +396,18 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         namespace (str):
             An optional namespace for the route. If given, it is prefixed to
             the name and separated by a colon.
+        max_body_size (int):
+            An optional maximum size of request bodies, in bytes.
+            Overrides the application's `max_body_size` for this route.
 
         # See Also
         - [check_route](#check-route) for the route validation algorithm.
         """
         return self.http_router.route(
-            pattern=pattern, name=name, namespace=namespace
+            pattern=pattern,
+            name=name,
+            namespace=namespace,
+            max_body_size=max_body_size,
         )
 
     def websocket_route(
@@ -432,7 +570,13 @@ class API(TemplatesMixin, metaclass=DocsMeta):
 
     async def dispatch_http(self, receive: Receive, send: Send, scope: Scope):
         assert scope["type"] == "http"
-        req = Request(scope, receive)
+        req = Request(
+            scope,
+            receive,
+            json_engine=self.json_engine,
+            media=self._media,
+            max_body_size=self.max_body_size,
+        )
         res = Response(req, media=self._media)
         res = await self.server_error_middleware(req, res)
         await res(receive, send)
@@ -459,9 +603,9 @@ class API(TemplatesMixin, metaclass=DocsMeta):
         path: str = scope["path"]
 
         # Return a sub-mounted extra app, if found
-        for prefix, app in self.apps.items():
-            if not path.startswith(prefix):
-                continue
+        mount = self.mount_router.match(path)
+        if mount is not None:
+            prefix, app = mount
             # Remove prefix from path so that the request is made according
             # to the mounted app's point of view.
             scope["path"] = path[len(prefix) :]
@@ -4,6 +4,7 @@ from inspect import getsource
 import click
 
 from . import __version__
+from .staticfiles import brotli, compress
 
 CUSTOM_COMMANDS_FILE_ENV_VAR = "BOCA_CUSTOM_COMMANDS_FILE"
 
@@ -61,6 +62,29 @@ def create_cli() -> click.Command:
         click.echo(click.style(f"Generated {path}", fg="green"))
         click.echo("Open the file and start building!")
 
+    @cli.command(name="compress:static")
+    @click.argument("directory", default="static")
+    @click.option(
+        "--min-size",
+        default=512,
+        show_default=True,
+        help="Files smaller than this number of bytes are not compressed.",
+    )
+    def compress_static(directory: str, min_size: int):
+        """Generate gzip and brotli versions of static files."""
+        if not os.path.isdir(directory):
+            raise click.BadParameter(
+                f"{directory} is not a directory.", param_hint="DIRECTORY"
+            )
+        if brotli is None:
+            click.echo(
+                "brotli is not installed: only gzip files are generated."
+            )
+        paths = compress(directory, min_size=min_size)
+        for path in paths:
+            click.echo(f"Generated {path}")
+        click.echo(click.style(f"Compressed {len(paths)} file(s)", fg="green"))
+
     return cli
 
 
@@ -1,6 +1,16 @@
-import asyncio
+import inspect
 import re
-from typing import Callable, List, TypeVar, Union, Optional, Any, Coroutine
+from functools import partial
+from typing import (
+    Awaitable,
+    Callable,
+    List,
+    TypeVar,
+    Union,
+    Optional,
+    Any,
+    Coroutine,
+)
 
 from starlette.concurrency import run_in_threadpool
 
@@ -24,16 +34,59 @@ async def call_async(
         or run in the thread pool (if a regular function).
     sync (bool):
         A hint as to whether `func` is synchronous. If not given, it is
-        inferred as `asyncio.iscoroutinefunction(func)`.
+        inferred using [is_async_callable](#is-async-callable).
 
     # See Also
+    - [to_async](#to-async) to avoid inspecting `func` on every call.
     - [Executing code in thread or process pools](https://docs.python.org/3/library/asyncio-eventloop.html#executing-code-in-thread-or-process-pools)
     """
-    if sync or (sync is None and not asyncio.iscoroutinefunction(func)):
+    if sync or (sync is None and not is_async_callable(func)):
         return await run_in_threadpool(func, *args, **kwargs)
     return await func(*args, **kwargs)
 
 
+def is_async_callable(func: Callable) -> bool:
+    """Return whether calling `func` returns an awaitable.
+
+    Supports coroutine functions, bound methods, `functools.partial`
+    objects and instances of classes that define `async def __call__()`.
+    """
+    while isinstance(func, partial):
+        func = func.func
+    if inspect.iscoroutinefunction(func):
+        return True
+    if inspect.isfunction(func) or inspect.ismethod(func):
+        return False
+    return inspect.iscoroutinefunction(getattr(func, "__call__", None))
+
+
+def to_async(
+    func: Union[Callable[..., Coroutine[Any, Any, _V]], Callable[..., _V]],
+    run_sync: Callable[..., Awaitable] = run_in_threadpool,
+) -> Callable[..., Awaitable[_V]]:
+    """Resolve a callable into an asynchronous callable.
+
+    This is the equivalent of [call_async](#call-async), except that
+    `func` is only inspected once, instead of on every call.
+
+    # Parameters
+    func (Callable): a synchronous or asynchronous callable.
+    run_sync (Callable):
+        An asynchronous function used to run `func` if it is synchronous,
+        called as `run_sync(func, *args, **kwargs)`.
+        Defaults to running `func` in the event loop's default thread pool.
+
+    # Returns
+    func (Callable):
+        `func` itself if it is asynchronous (see
+        [is_async_callable](#is-async-callable)), otherwise a function
+        which runs `func` using `run_sync`.
+    """
+    if is_async_callable(func):
+        return func
+    return partial(run_sync, func)
+
+
 def camel_to_snake(name: str) -> str:
     """Convert a `CamelCase` name to its `snake_case` version."""
     s1 = _camel_regex.sub(r"\1_\2", name)
@@ -45,16 +98,3 @@ def camel_to_snake(name: str) -> str:
 Environ = dict
 StartResponse = Callable[[str, List[str]], None]
 WSGIApp = Callable[[Environ, StartResponse], List[bytes]]
-
-
-def empty_wsgi_app() -> WSGIApp:
-    """Return a WSGI app that always returns 404 Not Found."""
-
-    def wsgi(environ, start_response):
-        status = "404 Not Found"
-        body = b"Not Found"
-        headers = [("Content-Type", "text/plain")]
-        start_response(status, headers)
-        return [body]
-
-    return wsgi
@@ -6,7 +6,7 @@ import jinja2
 from starlette.responses import HTMLResponse, PlainTextResponse
 
 from .app_types import ErrorHandler, HTTPApp
-from .compat import call_async
+from .compat import to_async
 from .misc import read_asset
 from .request import Request
 from .response import Response
@@ -70,7 +70,7 @@ class ServerErrorMiddleware(HTTPApp):
         self, app: HTTPApp, handler: ErrorHandler, debug: bool = False
     ) -> None:
         self.app = app
-        self.handler = handler
+        self.handler = to_async(handler)
         self.debug = debug
         self.exception = None
         self.jinja = jinja2.Environment()
@@ -112,7 +112,7 @@ class ServerErrorMiddleware(HTTPApp):
             if self.debug:
                 # In debug mode, return traceback responses.
                 res = self.debug_response(req, exc)
-            await call_async(self.handler, req, res, HTTPError(500))
+            await self.handler(req, res, HTTPError(500))
             return res
         else:
             return res
@@ -133,7 +133,7 @@ class HTTPErrorMiddleware(HTTPApp):
         self, exception_class: Type[Exception], handler: ErrorHandler
     ) -> None:
         assert issubclass(exception_class, Exception)
-        self._exception_handlers[exception_class] = handler
+        self._exception_handlers[exception_class] = to_async(handler)
 
     def _get_exception_handler(self, exc: Exception) -> Optional[ErrorHandler]:
         for cls, handler in self._exception_handlers.items():
@@ -148,7 +148,7 @@ class HTTPErrorMiddleware(HTTPApp):
             handler = self._get_exception_handler(exc)
             if handler is None:
                 raise exc from None
-            await call_async(handler, req, res, exc)
+            await handler(req, res, exc)
             return res
         else:
             return res
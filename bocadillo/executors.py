@@ -0,0 +1,381 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from importlib import import_module
+from time import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from .errors import HTTPError
+
+try:
+    import contextvars  # Python 3.7+ only.
+except ImportError:  # pragma: no cover
+    contextvars = None
+
+_V = TypeVar("_V")
+
+DEFAULT = "default"
+PROCESS = "process"
+
+
+def _timed(func: Callable[..., _V], args: tuple, kwargs: dict) -> Tuple:
+    # Call a function and return the time at which it started,
+    # along with the exception it raised or its result.
+    # NOTE: wall clock time is used because it can be compared across
+    # processes.
+    started = time()
+    try:
+        return started, None, func(*args, **kwargs)
+    except Exception as exc:
+        return started, exc, None
+
+
+class ThreadPool:
+    """A thread pool in which synchronous views and hooks are run.
+
+    The underlying `ThreadPoolExecutor` is created on first use.
+
+    # Parameters
+    name (str): the name of the pool, used to name its threads.
+    max_workers (int):
+        The maximum number of threads. Defaults to the default of
+        `concurrent.futures.ThreadPoolExecutor` on Python 3.8+, i.e.
+        the number of CPUs plus 4 (at most 32).
+    max_queue (int):
+        The maximum number of calls waiting for a free thread. When this
+        number is reached, further calls are rejected with an
+        `HTTPError(503)`. Defaults to `None` (no limit).
+
+    # Attributes
+    calls (int): the number of completed calls.
+    rejected (int): the number of calls rejected because the queue was full.
+    wait_time (float): the total time (in seconds) calls spent in the queue.
+    run_time (float): the total time (in seconds) calls spent running.
+    """
+
+    def __init__(
+        self,
+        name: str = DEFAULT,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.name = name
+        self.max_queue = max_queue
+        if max_workers is None:
+            max_workers = self._get_default_max_workers()
+        self._max_workers = max_workers
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self.calls = 0
+        self.rejected = 0
+        self.wait_time = 0.0
+        self.run_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_run_time = 0.0
+
+    def _get_default_max_workers(self) -> int:
+        # Same as `ThreadPoolExecutor` on Python 3.8+.
+        return min(32, (os.cpu_count() or 1) + 4)
+
+    def _create_executor(self) -> Executor:
+        return ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix=f"bocadillo-{self.name}",
+        )
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    @property
+    def max_workers(self) -> int:
+        """The maximum number of threads in the pool."""
+        return self._max_workers
+
+    @property
+    def queued(self) -> int:
+        """The number of calls currently waiting for a free thread."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _prepare(self, call: Callable) -> Callable:
+        if contextvars is not None:
+            # Run in the same context, like `starlette.concurrency`.
+            call = partial(contextvars.copy_context().run, call)
+        return call
+
+    async def run(self, func: Callable[..., _V], *args, **kwargs) -> _V:
+        """Run a function in the pool and return its result.
+
+        # Raises
+        HTTPError(503): if the queue of the pool is full.
+        """
+        if (
+            self.max_queue is not None
+            and self._in_flight >= self.max_workers + self.max_queue
+        ):
+            self.rejected += 1
+            raise HTTPError(503)
+
+        call = self._prepare(partial(_timed, func, args, kwargs))
+        loop = asyncio.get_event_loop()
+        submitted = time()
+        self._in_flight += 1
+        try:
+            started, exc, result = await loop.run_in_executor(
+                self.executor, call
+            )
+        finally:
+            self._in_flight -= 1
+
+        # NOTE: metrics are only updated from the event loop thread,
+        # so no locking is required.
+        self._record(started - submitted, time() - started)
+        if exc is not None:
+            raise exc
+        return result
+
+    def _record(self, wait_time: float, run_time: float):
+        self.calls += 1
+        self.wait_time += wait_time
+        self.run_time += run_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        self.max_run_time = max(self.max_run_time, run_time)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return usage metrics of the pool.
+
+        # Returns
+        metrics (dict):
+            Contains the pool's settings, the current number of calls
+            `in_flight` and `queued`, and counters for `calls`, `rejected`
+            calls, total and maximum `wait_time` (time spent in the queue)
+            and `run_time` (time spent running) in seconds.
+        """
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queued": self.queued,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "wait_time": self.wait_time,
+            "max_wait_time": self.max_wait_time,
+            "run_time": self.run_time,
+            "max_run_time": self.max_run_time,
+        }
+
+    async def startup(self):
+        """Start the pool. The `ThreadPool` is only started on first use."""
+
+    def shutdown(self):
+        """Shut down the underlying executor, if it was created."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class ProcessPool(ThreadPool):
+    """A process pool in which CPU-bound functions are run.
+
+    Extends [ThreadPool](#threadpool).
+
+    Functions, arguments and return values are pickled to be exchanged
+    with worker processes.
+    The underlying `ProcessPoolExecutor` is created and its worker
+    processes are started on `startup()` (or on first use).
+
+    # Parameters
+    start_method (str):
+        the multiprocessing start method, e.g. `"fork"` or `"spawn"`.
+        Defaults to the default start method of the platform.
+
+    # Raises
+    ValueError:
+        on startup, if the start method is not `"fork"` and a function
+        registered with [register_compute](#register-compute) cannot be
+        imported by worker processes.
+    """
+
+    def __init__(
+        self, name: str = PROCESS, start_method: Optional[str] = None, **kwargs
+    ):
+        super().__init__(name, **kwargs)
+        self.start_method = start_method
+
+    def _get_default_max_workers(self) -> int:
+        # Same as `ProcessPoolExecutor`.
+        return os.cpu_count() or 1
+
+    def _create_executor(self) -> Executor:
+        context = multiprocessing.get_context(self.start_method)
+        check_compute_functions(context.get_start_method())
+        return ProcessPoolExecutor(
+            max_workers=self._max_workers, mp_context=context
+        )
+
+    def _prepare(self, call: Callable) -> Callable:
+        # Context variables cannot be passed to other processes.
+        return call
+
+    async def startup(self):
+        """Create the executor and start all worker processes.
+
+        `ProcessPoolExecutor` spawns workers as calls are submitted, so
+        no-op calls are submitted to each worker. This way, the first
+        requests do not pay the cost of spawning processes.
+        """
+        if self._executor is None:
+            self._executor = self._create_executor()
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _noop)
+                for _ in range(self._max_workers)
+            )
+        )
+
+
+def _noop():
+    pass
+
+
+# Registry of functions run by views in a process pool.
+_COMPUTE_FUNCTIONS: Dict[str, Callable] = {}
+
+
+def get_compute_key(func: Callable) -> str:
+    module = func.__module__
+    if module == "__mp_main__":
+        # Name of the main script when spawned workers import it.
+        module = "__main__"
+    return f"{module}:{func.__qualname__}"
+
+
+def register_compute(func: Callable):
+    """Register a function so that it can be called in worker processes.
+
+    This is required because views are decorated, which means the names
+    of their functions refer to other objects and they cannot be pickled.
+
+    # See Also
+    - [check_compute_functions](#check-compute-functions)
+    """
+    _COMPUTE_FUNCTIONS[get_compute_key(func)] = func
+
+
+def check_compute_functions(start_method: str):
+    """Check that worker processes can look up registered functions.
+
+    Forked workers inherit registered functions. Other workers (e.g. with
+    the `spawn` or `forkserver` start methods) import the module of each
+    function instead, which fails for functions defined in a local scope,
+    or in the `__main__` module of an interactive session.
+
+    # Parameters
+    start_method (str): the start method of worker processes.
+
+    # Raises
+    ValueError: if a registered function cannot be looked up by workers.
+    """
+    if start_method == "fork":
+        return
+    main_is_importable = hasattr(sys.modules["__main__"], "__file__")
+    for key, func in _COMPUTE_FUNCTIONS.items():
+        if "<locals>" in func.__qualname__ or (
+            key.startswith("__main__:") and not main_is_importable
+        ):
+            raise ValueError(
+                f"Cannot run {key} in a process pool with the "
+                f"{start_method!r} start method: it must be defined at "
+                "the module level of a module or script."
+            )
+
+
+def call_compute(key: str, kwargs: dict) -> Any:
+    """Call a registered function. Meant to be run in worker processes."""
+    func = _COMPUTE_FUNCTIONS.get(key)
+    if func is None:
+        # Worker processes that do not inherit the parent's memory (i.e.
+        # not forked) register functions when importing their module.
+        import_module(key.split(":")[0])
+        func = _COMPUTE_FUNCTIONS[key]
+    return func(**kwargs)
+
+
+class Executors:
+    """Registry of named pools in which synchronous views are run.
+
+    # Parameters
+    config (dict):
+        A mapping of pool names to keyword arguments for `ThreadPool`.
+        The `"default"` pool is used for views which do not specify an
+        `executor`. Pools which are not configured are created on
+        demand with the settings of the `"default"` pool.
+        The `"process"` pool is a `ProcessPool`, and it only uses its
+        own settings.
+
+    # Example
+
+    ```python
+    executors = Executors(
+        {
+            "default": {"max_workers": 8, "max_queue": 100},
+            "reports": {"max_workers": 2},
+        }
+    )
+    ```
+    """
+
+    def __init__(self, config: Dict[str, dict] = None):
+        self._config = dict(config or {})
+        self._pools: Dict[str, ThreadPool] = {}
+
+    def get(self, name: Optional[str] = None) -> ThreadPool:
+        """Return the pool with the given name, creating it if necessary.
+
+        # Parameters
+        name (str): defaults to `"default"`.
+        """
+        if name is None:
+            name = DEFAULT
+        pool = self._pools.get(name)
+        if pool is None:
+            if name == PROCESS:
+                pool = ProcessPool(name, **self._config.get(name, {}))
+            else:
+                options = self._config.get(name, self._config.get(DEFAULT, {}))
+                pool = ThreadPool(name, **options)
+            self._pools[name] = pool
+        return pool
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return the metrics of each pool, indexed by name.
+
+        # See Also
+        - [ThreadPool.metrics](#metrics)
+        """
+        return {name: pool.metrics() for name, pool in self._pools.items()}
+
+    async def startup(self):
+        """Start all pools."""
+        for pool in self._pools.values():
+            await pool.startup()
+
+    async def shutdown(self):
+        """Shut down all pools.
+
+        Pools are shut down in a separate thread so that waiting for
+        pending calls does not block the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        for pool in self._pools.values():
+            await loop.run_in_executor(None, pool.shutdown)
@@ -1,8 +1,12 @@
 import inspect
 from functools import wraps
-from typing import Callable, Dict, Union, Awaitable, Type
+from types import MethodType
+from typing import Callable, Dict, Union, Awaitable, Type, List, Tuple
+from typing import Optional
 
-from .compat import call_async
+from starlette.concurrency import run_in_threadpool
+
+from .compat import call_async, to_async
 from .request import Request
 from .response import Response
 from .routing import HTTPRoute
@@ -14,6 +18,9 @@ HookCollection = Dict[HTTPRoute, HookFunction]
 BEFORE = "before"
 AFTER = "after"
 
+# Name of the attribute where hooks are stored on a handler.
+HOOKS_ATTR = "__bocadillo_hooks__"
+
 
 class Hooks:
     """Hooks manager."""
@@ -37,10 +44,6 @@ class Hooks:
     def _hook_decorator(
         self, hook_type: str, hook: HookFunction, *args, **kwargs
     ):
-        # Enclose args and kwargs
-        async def hook_func(req: Request, res: Response, params: dict):
-            await call_async(hook, req, res, params, *args, **kwargs)
-
         def decorator(handler: Union[Type[View], Handler]):
             """Attach the hook to the given handler."""
             if inspect.isclass(handler):
@@ -50,38 +53,156 @@ class Hooks:
                     setattr(view_cls, method, decorator(handler))
                 return view_cls
             else:
-                return _with_hook(hook_type, hook_func, handler)
+                return _with_hook(hook_type, (hook, args, kwargs), handler)
 
         return decorator
 
 
-def _with_hook(hook_type: str, func: HookFunction, handler: Handler):
-    async def call_hook(args, kw):
-        if len(args) == 2:
-            req, res = args
-        else:
-            # method that has `self` as a first parameter
-            req, res = args[1:3]
-        assert isinstance(req, Request)
-        assert isinstance(res, Response)
-        await call_async(func, req, res, kw)
+# A hook function, along with the extra arguments it should be passed.
+_Hook = Tuple[HookFunction, tuple, dict]
 
-    if hook_type == BEFORE:
 
-        @wraps(handler)
-        async def with_hook(*args, **kwargs):
-            await call_hook(args, kwargs)
-            await call_async(handler, *args, **kwargs)
+class HookedHandler:
+    """Hooks attached to a handler.
 
-    else:
-        assert hook_type == AFTER
+    Hooks are stored as metadata on the decorated handler, and compiled
+    into a single pipeline when the view is created.
+    See [compile_handler](#compile-handler).
 
-        @wraps(handler)
-        async def with_hook(*args, **kwargs):
-            await call_async(handler, *args, **kwargs)
-            await call_hook(args, kwargs)
+    # Attributes
+    handler (callable): the handler hooks are attached to.
+    before (list): hooks to call before the handler, in order.
+    after (list): hooks to call after the handler, in order.
+    wrapper (callable):
+        the function returned by the hook decorators. Metadata found on
+        any other object (e.g. copied by `functools.wraps()` onto a user
+        decorator) is ignored.
+    """
 
-    return with_hook
+    def __init__(
+        self,
+        handler: Handler,
+        before: List[_Hook],
+        after: List[_Hook],
+        wrapper: Handler = None,
+    ):
+        self.handler = handler
+        self.before = before
+        self.after = after
+        self.wrapper = wrapper
+
+
+def _get_hooked(handler: Handler) -> Optional[HookedHandler]:
+    # Return the hooks attached to this exact handler, if any.
+    hooked: HookedHandler = getattr(handler, HOOKS_ATTR, None)
+    func = handler.__func__ if inspect.ismethod(handler) else handler
+    if hooked is None or hooked.wrapper is not func:
+        # NOTE: the handler may be a decorator which copied the metadata
+        # of a hooked function. It must be treated as an opaque handler,
+        # otherwise it would be skipped.
+        return None
+    return hooked
+
+
+def _with_hook(hook_type: str, hook: _Hook, handler: Handler) -> Handler:
+    hooked = _get_hooked(handler)
+    if hooked is None:
+        hooked = HookedHandler(handler, before=[], after=[])
+
+    # The outermost decorator runs first for before hooks,
+    # and last for after hooks.
+    if hook_type == BEFORE:
+        before = [hook, *hooked.before]
+        after = hooked.after
+    else:
+        assert hook_type == AFTER
+        before = hooked.before
+        after = [*hooked.after, hook]
+
+    handler = hooked.handler
+
+    @wraps(handler)
+    async def with_hooks(*args, **kwargs):
+        # NOTE: this is only used if the handler is called directly.
+        # Views call the pipeline built by `compile_handler()` instead.
+        req, res = args[-2:]
+        for func, hook_args, hook_kwargs in before:
+            await call_async(func, req, res, kwargs, *hook_args, **hook_kwargs)
+        await call_async(handler, *args, **kwargs)
+        for func, hook_args, hook_kwargs in after:
+            await call_async(func, req, res, kwargs, *hook_args, **hook_kwargs)
+
+    setattr(
+        with_hooks,
+        HOOKS_ATTR,
+        HookedHandler(handler, before, after, wrapper=with_hooks),
+    )
+    return with_hooks
+
+
+def _compile_hook(hook: _Hook, run_sync: Callable) -> HookFunction:
+    func, args, kwargs = hook
+    func = to_async(func, run_sync=run_sync)
+    if not args and not kwargs:
+        return func
+
+    async def hook_func(req: Request, res: Response, params: dict):
+        await func(req, res, params, *args, **kwargs)
+
+    return hook_func
+
+
+def compile_handler(
+    handler: Handler,
+    run_sync: Callable[..., Awaitable] = run_in_threadpool,
+    run_handler: Callable[..., Awaitable] = None,
+) -> Handler:
+    """Build an async handler which calls hooks and the handler in sequence.
+
+    Whether each hook (and the handler itself) is synchronous is only
+    determined once, so calling the compiled handler has no overhead
+    compared to calling hooks and the handler by hand.
+
+    # Parameters
+    handler (callable):
+        a function or method, possibly decorated with hooks.
+    run_sync (callable):
+        used to run the handler and hooks if they are synchronous.
+        See also [to_async](./compat.md#to-async).
+    run_handler (callable):
+        if given, used instead of `run_sync` to run the handler itself
+        (but not its hooks) if it is synchronous.
+
+    # Returns
+    handler (coroutine function):
+        an asynchronous handler.
+    """
+    if run_handler is None:
+        run_handler = run_sync
+
+    hooked = _get_hooked(handler)
+    if hooked is None:
+        call = to_async(handler, run_sync=run_handler)
+        return call if call is handler else wraps(handler)(call)
+
+    func = hooked.handler
+    if inspect.ismethod(handler):
+        # Bind the undecorated handler to the view object.
+        func = MethodType(func, handler.__self__)
+
+    call = to_async(func, run_sync=run_handler)
+    before = [_compile_hook(hook, run_sync) for hook in hooked.before]
+    after = [_compile_hook(hook, run_sync) for hook in hooked.after]
+
+    @wraps(func)
+    async def pipeline(req: Request, res: Response, **params):
+        for hook in before:
+            await hook(req, res, params)
+        await call(req, res, **params)
+        for hook in after:
+            await hook(req, res, params)
+
+    return pipeline
 
 
 # Pre-bind to module
@@ -0,0 +1,82 @@
+import json
+from importlib import import_module
+from typing import Any, Callable, NamedTuple, Tuple, Union
+
+Dumps = Callable[[Any], Union[str, bytes]]
+Loads = Callable[[Union[str, bytes]], Any]
+
+
+class JSONEngine(NamedTuple):
+    """A pair of JSON encoding and decoding functions.
+
+    # Attributes
+    name (str): the name of the engine, e.g. `"orjson"`.
+    dumps (callable):
+        serializes a value to JSON. May return `str` or `bytes`.
+    loads (callable):
+        deserializes JSON given as `str` or `bytes`.
+    """
+
+    name: str
+    dumps: Dumps
+    loads: Loads
+
+
+STDLIB = JSONEngine("json", json.dumps, json.loads)
+
+# Third-party engines, by order of preference.
+THIRD_PARTY = ("orjson", "ujson")
+
+JSONEngineParam = Union[str, JSONEngine, Tuple[Dumps, Loads]]
+
+
+def _import_engine(name: str) -> JSONEngine:
+    module = import_module(name)
+    return JSONEngine(name, module.dumps, module.loads)
+
+
+def get_json_engine(engine: JSONEngineParam = None) -> JSONEngine:
+    """Return a JSON engine.
+
+    # Parameters
+    engine (str or tuple):
+        One of:
+
+        - `"json"` or `None`: the standard library's `json` module.
+        - `"orjson"` or `"ujson"`: use this third-party library.
+        - `"auto"`: the first of `orjson` or `ujson` which is installed,
+        falling back to `json`.
+        - A `(dumps, loads)` pair of functions.
+
+    # Returns
+    engine (JSONEngine): a JSON engine.
+
+    # Raises
+    ImportError: if the requested third-party library is not installed.
+    ValueError: if the engine name is unknown.
+    """
+    if engine is None or engine == STDLIB.name:
+        return STDLIB
+
+    if isinstance(engine, JSONEngine):
+        return engine
+
+    if isinstance(engine, tuple):
+        dumps, loads = engine
+        return JSONEngine("custom", dumps, loads)
+
+    if engine == "auto":
+        for name in THIRD_PARTY:
+            try:
+                return _import_engine(name)
+            except ImportError:
+                pass
+        return STDLIB
+
+    if engine in THIRD_PARTY:
+        return _import_engine(engine)
+
+    raise ValueError(
+        f"Unknown JSON engine: {engine!r} "
+        f"(expected one of: json, {', '.join(THIRD_PARTY)}, auto)"
+    )
@@ -0,0 +1,271 @@
+"""Incremental parsing of JSON documents received in chunks."""
+
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*')
+# Complete strings are matched at once. A lone quote means the string
+# is not complete yet.
+_CONTAINER_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|["\[\]{}]')
+_QUOTE, _OPENING = ord('"'), b"[{"
+_SCALAR_END = re.compile(rb"[ \t\n\r,\]}]")
+
+
+class MalformedJSON(ValueError):
+    """Raised when a JSON stream is malformed."""
+
+
+class JSONStreamTooLarge(Exception):
+    """Raised when a JSON stream or one of its values exceeds a size limit."""
+
+
+class _Reader:
+    # A buffer over a stream of byte chunks.
+    # Bytes before `pos` are discarded when more data is needed, except
+    # those after `mark` (i.e. the value being captured).
+
+    def __init__(
+        self,
+        chunks: AsyncIterable[bytes],
+        max_item_size: Optional[int],
+        limit: Optional[int],
+    ):
+        self._chunks = chunks.__aiter__()
+        self._max_item_size = max_item_size
+        self._limit = limit
+        self._received = 0
+        self.eof = False
+        self.data = bytearray()
+        self.pos = 0
+        self.mark: Optional[int] = None
+
+    async def fill(self) -> bool:
+        # Read the next chunk. Returns `False` if the stream is exhausted.
+        if self.eof:
+            return False
+
+        keep = self.pos if self.mark is None else self.mark
+        del self.data[:keep]
+        self.pos -= keep
+        if self.mark is not None:
+            self.mark = 0
+            if (
+                self._max_item_size is not None
+                and len(self.data) > self._max_item_size
+            ):
+                raise JSONStreamTooLarge
+
+        chunk = b""
+        while not chunk:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self.eof = True
+                return False
+
+        self._received += len(chunk)
+        if self._limit is not None and self._received > self._limit:
+            raise JSONStreamTooLarge
+        self.data += chunk
+        return True
+
+    async def peek(self) -> Optional[int]:
+        # Skip whitespace and return the next byte, or `None` at the end.
+        while True:
+            self.pos = _WHITESPACE.match(self.data, self.pos).end()
+            if self.pos < len(self.data):
+                return self.data[self.pos]
+            if not await self.fill():
+                return None
+
+    async def expect(self, *chars: bytes) -> int:
+        char = await self.peek()
+        if char is None or char not in b"".join(chars):
+            expected = ", ".join(repr(c.decode()) for c in chars)
+            raise MalformedJSON(f"Expected one of: {expected}")
+        self.pos += 1
+        return char
+
+    async def skip_string(self):
+        # Move past a string. `pos` must be on the opening quote.
+        match = _STRING.match(self.data, self.pos)
+        if match is not None:
+            self.pos = match.end()
+            return
+
+        # The string is incomplete: move through it as data comes in,
+        # so that scanned bytes can be discarded.
+        self.pos += 1
+        while True:
+            self.pos = _STRING_BODY.match(self.data, self.pos).end()
+            # NOTE: the body may stop before a trailing backslash
+            # whose escaped character has not been received yet.
+            if self.pos < len(self.data) and self.data[self.pos] == _QUOTE:
+                self.pos += 1
+                return
+            if not await self.fill():
+                raise MalformedJSON("Unterminated string")
+
+    async def skip_scalar(self):
+        # Move past a number, `true`, `false` or `null`.
+        while True:
+            match = _SCALAR_END.search(self.data, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return
+            self.pos = len(self.data)
+            if not await self.fill():
+                return
+
+    async def skip_value(self):
+        # Move past any value. `pos` must be on its first byte.
+        char = self.data[self.pos]
+        if char == _QUOTE:
+            await self.skip_string()
+            return
+        if char not in _OPENING:
+            await self.skip_scalar()
+            return
+
+        data = self.data
+        depth = 0
+        while True:
+            match = _CONTAINER_TOKEN.search(data, self.pos)
+            if match is None:
+                self.pos = len(data)
+            else:
+                start, end = match.span()
+                char = data[start]
+                if char != _QUOTE:
+                    self.pos = end
+                    depth += 1 if char in _OPENING else -1
+                    if depth == 0:
+                        return
+                    continue
+                if end - start > 1:
+                    # Complete string.
+                    self.pos = end
+                else:
+                    self.pos = start
+                    await self.skip_string()
+                    data = self.data
+                continue
+            if not await self.fill():
+                raise MalformedJSON("Unterminated container")
+            data = self.data
+
+    async def capture_value(self) -> bytes:
+        # Move past a value and return its raw bytes.
+        self.mark = self.pos
+        try:
+            await self.skip_value()
+            return bytes(self.data[self.mark : self.pos])
+        finally:
+            self.mark = None
+
+
+def _join(prefix: str, name: str) -> str:
+    return f"{prefix}.{name}" if prefix else name
+
+
+async def _decode_value(reader: _Reader, loads: Callable) -> Any:
+    if await reader.peek() is None:
+        raise MalformedJSON("Unexpected end of data")
+    raw = await reader.capture_value()
+    try:
+        return loads(raw)
+    except ValueError as exc:
+        raise MalformedJSON(str(exc)) from exc
+
+
+async def _iter_values(
+    reader: _Reader, prefix: str, path: str, loads: Callable
+) -> AsyncIterator[Any]:
+    char = await reader.peek()
+    if char is None:
+        raise MalformedJSON("Unexpected end of data")
+
+    if prefix == path:
+        yield await _decode_value(reader, loads)
+        return
+
+    descend = path.startswith(prefix + ".") if prefix else True
+
+    if descend and char == ord("["):
+        reader.pos += 1
+        item_prefix = _join(prefix, "item")
+        if await reader.peek() == ord("]"):
+            reader.pos += 1
+            return
+        while True:
+            if item_prefix == path:
+                # Fast path for the most common case.
+                yield await _decode_value(reader, loads)
+            else:
+                async for value in _iter_values(
+                    reader, item_prefix, path, loads
+                ):
+                    yield value
+            if await reader.expect(b",", b"]") == ord("]"):
+                return
+
+    elif descend and char == ord("{"):
+        reader.pos += 1
+        if await reader.peek() == ord("}"):
+            reader.pos += 1
+            return
+        while True:
+            if await reader.peek() != ord('"'):
+                raise MalformedJSON("Expected an object key")
+            try:
+                key = json.loads(await reader.capture_value())
+            except ValueError as exc:
+                raise MalformedJSON(str(exc)) from exc
+            await reader.expect(b":")
+            member_prefix = _join(prefix, key)
+            async for value in _iter_values(reader, member_prefix, path, loads):
+                yield value
+            if await reader.expect(b",", b"}") == ord("}"):
+                return
+
+    else:
+        await reader.skip_value()
+
+
+async def iter_json(
+    chunks: AsyncIterable[bytes],
+    path: str = "item",
+    loads: Callable[[bytes], Any] = json.loads,
+    max_item_size: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    """Parse values out of a JSON document received in chunks.
+
+    Only the bytes of the value being parsed are buffered: other parts
+    of the document are discarded as soon as they are scanned.
+
+    # Parameters
+    chunks (async iterable): chunks of bytes, e.g. `Request.stream()`.
+    path (str):
+        The location of the values to yield, as dot-separated object
+        keys, where `item` refers to the items of an array.
+        For example, `"item"` yields the items of a top-level array,
+        and `"items.item"` yields the items of the array located
+        at the `"items"` key of a top-level object.
+    loads (callable): used to deserialize each value.
+    max_item_size (int): the maximum size of a value, in bytes.
+    limit (int): the maximum size of the whole document, in bytes.
+
+    # Raises
+    MalformedJSON: if the document is malformed.
+    JSONStreamTooLarge:
+        if the document or a value exceeds `limit` or `max_item_size`.
+    """
+    reader = _Reader(chunks, max_item_size=max_item_size, limit=limit)
+    async for value in _iter_values(reader, "", path, loads):
+        yield value
+    if await reader.peek() is not None:
+        raise MalformedJSON("Extra data")
@@ -1,7 +1,24 @@
 import json
-from typing import Any, Callable, Union, List
+from functools import lru_cache
+from typing import Any, Callable, Union, List, Optional, Tuple
 
-MediaHandler = Callable[[Any], str]
+from .json_engines import JSONEngine
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+# Content produced by media handlers. `str` is encoded to UTF-8, while
+# binary content is sent as is (i.e. without being copied).
+Content = Union[str, bytes, bytearray, memoryview]
+MediaHandler = Callable[[Any], Content]
+MediaDecoder = Callable[[bytes], Any]
 
 
 def handle_json(value: Union[dict, list]) -> str:
@@ -28,17 +45,165 @@ def handle_text(value: Any) -> str:
     return str(value)
 
 
-def get_default_handlers() -> dict:
+def handle_msgpack(value: Any) -> bytes:
+    """Serialize a value to MessagePack using `msgpack.packb()`.
+
+    Only available if `msgpack` is installed.
+
+    # Parameters
+    value (any): the value to serialize.
+
+    # Returns
+    data (bytes): the serialized value.
+    """
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def handle_cbor(value: Any) -> bytes:
+    """Serialize a value to CBOR using `cbor2.dumps()`.
+
+    Only available if `cbor2` is installed.
+
+    # Parameters
+    value (any): the value to serialize.
+
+    # Returns
+    data (bytes): the serialized value.
+    """
+    return cbor2.dumps(value)
+
+
+def get_default_handlers(json_engine: JSONEngine = None) -> dict:
     """Return the built-in media handlers.
 
+    # Parameters
+    json_engine (JSONEngine):
+        if given, its `dumps()` function is used as JSON media handler
+        instead of [handle_json](#handle-json).
+
     # Returns
     handlers (dict): a mapping of media types to their media handler.
+    MessagePack and CBOR handlers are only included if `msgpack` and
+    `cbor2` are installed, respectively.
     """
-    return {
-        Media.JSON: handle_json,
+    handlers = {
+        Media.JSON: handle_json if json_engine is None else json_engine.dumps,
         Media.PLAIN_TEXT: handle_text,
         Media.HTML: handle_text,
     }
+    if msgpack is not None:
+        handlers[Media.MSGPACK] = handle_msgpack
+    if cbor2 is not None:
+        handlers[Media.CBOR] = handle_cbor
+    return handlers
+
+
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 encoded bytes to a string.
+
+    # Parameters
+    data (bytes): the data to decode.
+
+    # Returns
+    text (str): the decoded string.
+    """
+    return data.decode("utf-8")
+
+
+def decode_msgpack(data: bytes) -> Any:
+    """Deserialize MessagePack data using `msgpack.unpackb()`.
+
+    Only available if `msgpack` is installed.
+
+    # Parameters
+    data (bytes): the data to deserialize.
+
+    # Returns
+    value (any): the deserialized value.
+
+    # Raises
+    ValueError: if the data is malformed.
+    """
+    try:
+        return msgpack.unpackb(data, raw=False)
+    except msgpack.UnpackException as exc:
+        raise ValueError(str(exc)) from exc
+
+
+def decode_cbor(data: bytes) -> Any:
+    """Deserialize CBOR data using `cbor2.loads()`.
+
+    Only available if `cbor2` is installed.
+
+    # Parameters
+    data (bytes): the data to deserialize.
+
+    # Returns
+    value (any): the deserialized value.
+
+    # Raises
+    ValueError: if the data is malformed.
+    """
+    try:
+        return cbor2.loads(data)
+    except cbor2.CBORDecodeError as exc:
+        raise ValueError(str(exc)) from exc
+
+
+def get_default_decoders(json_engine: JSONEngine = None) -> dict:
+    """Return the built-in media decoders.
+
+    # Parameters
+    json_engine (JSONEngine):
+        if given, its `loads()` function is used to decode JSON instead
+        of `json.loads()`.
+
+    # Returns
+    decoders (dict): a mapping of media types to their media decoder.
+    MessagePack and CBOR decoders are only included if `msgpack` and
+    `cbor2` are installed, respectively.
+    """
+    decoders = {
+        Media.JSON: json.loads if json_engine is None else json_engine.loads,
+        Media.PLAIN_TEXT: decode_text,
+        Media.HTML: decode_text,
+    }
+    if msgpack is not None:
+        decoders[Media.MSGPACK] = decode_msgpack
+    if cbor2 is not None:
+        decoders[Media.CBOR] = decode_cbor
+    return decoders
+
+
+def parse_accept(accept: str) -> List[str]:
+    """Parse an `Accept` header.
+
+    # Parameters
+    accept (str): the value of an `Accept` header.
+
+    # Returns
+    media_ranges (list of str):
+        accepted media ranges (e.g. `"application/*"`), sorted by
+        decreasing quality. Media ranges with a quality of zero are
+        excluded. Media ranges of equal quality are kept in order.
+    """
+    ranges = []
+    for index, item in enumerate(accept.split(",")):
+        media_range, *params = item.split(";")
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, index, media_range))
+    return [media_range for _, _, media_range in sorted(ranges)]
 
 
 class Media:
@@ -47,21 +212,57 @@ class Media:
     # Parameters
     media_type (str):
         The media type that will be used when serializing values.
+    json_engine (JSONEngine):
+        The JSON engine used to serialize values to JSON.
+        Defaults to the standard library's `json` module.
+    negotiation (bool):
+        Whether to pick the media type based on the request's `Accept`
+        header. See [negotiate](#negotiate). Defaults to `False`.
 
     # Attributes
     handlers (dict):
         A mapping of media types to `(Any) -> str` callables.
+        Handlers may also return `bytes`, `bytearray` or `memoryview`
+        objects, which are sent as is.
+    decoders (dict):
+        A mapping of media types to `(bytes) -> Any` callables, used to
+        decode request bodies. Decoders should raise a `ValueError` if
+        the data is malformed.
+    negotiable (set):
+        The media types which can be picked by content negotiation, in
+        addition to the configured media type. Defaults to JSON,
+        MessagePack and CBOR. Text handlers are excluded because they
+        would send the `str()` of structured values.
     JSON (str): `application/json`
     PLAIN_TEXT (str): `text/plain`
     HTML (str): `text/html`
+    MSGPACK (str): `application/msgpack`
+    CBOR (str): `application/cbor`
     """
 
     JSON = "application/json"
     PLAIN_TEXT = "text/plain"
     HTML = "text/html"
+    MSGPACK = "application/msgpack"
+    CBOR = "application/cbor"
 
-    def __init__(self, media_type: str):
-        self.handlers = get_default_handlers()
+    # Number of distinct `Accept` header values whose negotiated media
+    # type is cached.
+    NEGOTIATION_CACHE_SIZE = 256
+
+    def __init__(
+        self,
+        media_type: str,
+        json_engine: JSONEngine = None,
+        negotiation: bool = False,
+    ):
+        self.handlers = get_default_handlers(json_engine)
+        self.decoders = get_default_decoders(json_engine)
+        self.negotiation = negotiation
+        self.negotiable = {self.JSON, self.MSGPACK, self.CBOR}
+        self._negotiate = lru_cache(maxsize=self.NEGOTIATION_CACHE_SIZE)(
+            self._find_media_type
+        )
         self.type = media_type
 
     def serialize(self, value: Any, media_type: str):
@@ -76,6 +277,79 @@ class Media:
         handler = self.handlers[media_type]
         return handler(value)
 
+    def deserialize(self, data: bytes, media_type: str) -> Any:
+        """Deserialize data using the given media type.
+
+        # Parameters
+        data (bytes): the data to deserialize, e.g. a request body.
+        media_type (str):
+            The media type of the data. Determines which media decoder
+            is used.
+
+        # Returns
+        value (any): the deserialized value.
+
+        # Raises
+        UnsupportedMediaType: if no decoder exists for `media_type`.
+        ValueError: if the data is malformed.
+        """
+        try:
+            decoder = self.decoders[media_type]
+        except KeyError:
+            raise UnsupportedMediaType(
+                media_type, available=list(self.decoders)
+            ) from None
+        return decoder(data)
+
+    @staticmethod
+    def _find_media_type(
+        accept: str, default: str, media_types: Tuple[str, ...]
+    ) -> str:
+        for media_range in parse_accept(accept):
+            if media_range in media_types:
+                return media_range
+            if media_range == "*/*":
+                return default
+            if media_range.endswith("/*"):
+                prefix = media_range[:-1]
+                if default.startswith(prefix):
+                    return default
+                for media_type in media_types:
+                    if media_type.startswith(prefix):
+                        return media_type
+        return default
+
+    def negotiate(self, accept: Optional[str]) -> str:
+        """Return the media type which best matches an `Accept` header.
+
+        Only the configured media type and the `negotiable` media types
+        which have a handler can be picked.
+
+        Results are cached per distinct header value, configured media
+        type and candidate media types, so that changes to `handlers` or
+        `negotiable` (including in-place changes) are taken into account.
+
+        # Parameters
+        accept (str): the value of an `Accept` header, or `None`.
+
+        # Returns
+        media_type (str):
+            the supported media type with the highest quality in `accept`.
+            Wildcards prefer the configured media type. If no supported
+            media type is acceptable, or if `accept` is `None`, the
+            configured media type is returned.
+        """
+        if not accept:
+            return self.type
+        # NOTE: handlers may have been changed in place since the last call.
+        negotiable = self.negotiable
+        media_types = tuple(
+            media_type
+            for media_type in self.handlers
+            if media_type in negotiable or media_type == self.type
+        )
+        return self._negotiate(accept, self.type, media_types)
+
     @property
     def type(self) -> str:
         """Get or set the configured media type.
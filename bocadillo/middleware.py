@@ -1,7 +1,7 @@
 from typing import Optional, Awaitable
 
 from .app_types import HTTPApp
-from .compat import call_async
+from .compat import to_async
 from .request import Request
 from .response import Response
 
@@ -18,6 +18,8 @@ class Middleware(HTTPApp):
     def __init__(self, app: HTTPApp, **kwargs):
         self.app = app
         self.kwargs = kwargs
+        self._before_dispatch = to_async(self.before_dispatch)
+        self._after_dispatch = to_async(self.after_dispatch)
 
     async def before_dispatch(
         self, req: Request, res: Response
@@ -67,13 +69,13 @@ class Middleware(HTTPApp):
         # Returns
         res (Response): a Response object.
         """
-        before_res = await call_async(self.before_dispatch, req, res)
+        before_res = await self._before_dispatch(req, res)
         if before_res:
             return before_res
 
         res = await self.app(req, res)
 
-        res = await call_async(self.after_dispatch, req, res) or res
+        res = await self._after_dispatch(req, res) or res
 
         return res
 
@@ -0,0 +1,237 @@
+"""Streaming parsing of `multipart/form-data` request bodies."""
+
+import re
+from typing import AsyncIterable, AsyncIterator, Dict, Optional, Tuple
+
+# Bytes are read from the body until at least this number of them can be
+# returned, in order to limit the number of writes made by consumers.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_HEADER_SIZE = 16 * 1024
+
+_CRLF = b"\r\n"
+_PARAM = re.compile(r';\s*([^=;\s]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^;]*)')
+
+
+def _malformed(detail: str) -> Exception:
+    from .errors import HTTPError  # prevent circular imports
+
+    return HTTPError(400, detail=f"Malformed multipart body: {detail}.")
+
+
+def parse_options_header(value: str) -> Tuple[str, Dict[str, str]]:
+    """Parse a header such as `Content-Type` or `Content-Disposition`.
+
+    # Parameters
+    value (str): e.g. `'form-data; name="file"; filename="a.txt"'`.
+
+    # Returns
+    parsed (tuple):
+        the lower-cased main value (e.g. `"form-data"`) and a dictionary
+        of (unquoted) parameters, with lower-cased names.
+    """
+    main, _, rest = value.partition(";")
+    params = {}
+    for match in _PARAM.finditer(";" + rest):
+        name, param = match.groups()
+        param = param.strip()
+        if len(param) >= 2 and param[0] == param[-1] == '"':
+            param = re.sub(r"\\(.)", r"\1", param[1:-1])
+        params[name.lower()] = param
+    return main.strip().lower(), params
+
+
+class Part:
+    """A part of a multipart body.
+
+    Its content is not loaded in memory: it is read from the request as
+    the part is consumed, using `read()` or by iterating over it. Parts
+    must be consumed in order: if a part was not fully read, the rest of it
+    is skipped when moving on to the next part.
+
+    # Attributes
+    headers (dict): the headers of the part, with lower-cased names.
+    name (str): the name of the form field, if any.
+    filename (str): the name of the uploaded file, if any.
+    content_type (str): the content type of the part, if any.
+    """
+
+    def __init__(self, headers: Dict[str, str], parser: "MultipartParser"):
+        self.headers = headers
+        _, params = parse_options_header(headers.get("content-disposition", ""))
+        self.name: Optional[str] = params.get("name")
+        self.filename: Optional[str] = params.get("filename")
+        self.content_type: Optional[str] = headers.get("content-type")
+        self._parser = parser
+
+    async def read(self, size: int = -1) -> bytes:
+        """Read the content of the part.
+
+        # Parameters
+        size (int):
+            the maximum number of bytes to read. If negative (the default),
+            the rest of the part is read and returned at once.
+
+        # Returns
+        data (bytes): empty bytes once the part has been fully read.
+        """
+        if size >= 0:
+            return await self._parser.read_chunk(size)
+        chunks = []
+        async for chunk in self:
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self._parser.read_chunk()
+            if not chunk:
+                break
+            yield chunk
+
+    def __repr__(self) -> str:
+        return f"<Part name={self.name!r} filename={self.filename!r}>"
+
+
+class MultipartParser:
+    """Parse a multipart body received in chunks.
+
+    Iterating over the parser yields [Part](#part) objects.
+    If the body is malformed, `HTTPError(400)` is raised.
+
+    # Parameters
+    chunks (async iterable): chunks of bytes, e.g. `Request.stream()`.
+    boundary (bytes): the boundary given in the `Content-Type` header.
+    chunk_size (int):
+        the minimum size of chunks yielded by parts (except the last one).
+    max_header_size (int): the maximum size of the headers of a part.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterable[bytes],
+        boundary: bytes,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_header_size: int = DEFAULT_MAX_HEADER_SIZE,
+    ):
+        self._chunks = chunks.__aiter__()
+        self._delimiter = _CRLF + b"--" + boundary
+        self._chunk_size = chunk_size
+        self._max_header_size = max_header_size
+        # NOTE: the first boundary is not preceded by a CRLF.
+        self._buffer = bytearray(_CRLF)
+        self._part_done = True
+
+    async def _fill(self) -> bool:
+        async for chunk in self._chunks:
+            if chunk:
+                self._buffer += chunk
+                return True
+        return False
+
+    async def _require(self, size: int):
+        # Read data until the buffer holds at least `size` bytes.
+        while len(self._buffer) < size:
+            if not await self._fill():
+                raise _malformed("Unexpected end of body")
+
+    async def _find(self, needle: bytes, limit: Optional[int] = None) -> int:
+        # Return the index of `needle` in the buffer, reading more data
+        # if necessary.
+        start = 0
+        while True:
+            index = self._buffer.find(needle, start)
+            if index != -1:
+                return index
+            if limit is not None and len(self._buffer) > limit:
+                raise _malformed("Part headers are too large")
+            start = max(0, len(self._buffer) - len(needle) + 1)
+            if not await self._fill():
+                raise _malformed("Unexpected end of body")
+
+    async def _skip_preamble(self):
+        # Discard bytes until the first boundary.
+        delimiter = self._delimiter
+        while True:
+            index = self._buffer.find(delimiter)
+            if index != -1:
+                del self._buffer[: index + len(delimiter)]
+                return
+            del self._buffer[: max(0, len(self._buffer) - len(delimiter) + 1)]
+            if not await self._fill():
+                raise _malformed("Missing boundary")
+
+    async def read_chunk(self, size: Optional[int] = None) -> bytes:
+        """Read the next chunk of the current part.
+
+        # Parameters
+        size (int): if given, the maximum size of the chunk.
+
+        # Returns
+        chunk (bytes): empty bytes at the end of the part.
+        """
+        if self._part_done:
+            return b""
+
+        delimiter = self._delimiter
+        buffer = self._buffer
+        while True:
+            index = buffer.find(delimiter)
+            if index != -1:
+                n = index if size is None else min(index, size)
+                chunk = bytes(buffer[:n])
+                del buffer[:n]
+                if n == index:
+                    del buffer[: len(delimiter)]
+                    self._part_done = True
+                return chunk
+
+            # Bytes which cannot be the start of the delimiter.
+            available = len(buffer) - len(delimiter) + 1
+            if available >= (self._chunk_size if size is None else size):
+                n = available if size is None else size
+                chunk = bytes(buffer[:n])
+                del buffer[:n]
+                return chunk
+
+            if not await self._fill():
+                raise _malformed("Unexpected end of body")
+
+    async def _read_headers(self) -> Dict[str, str]:
+        await self._require(2)
+        if self._buffer.startswith(_CRLF):
+            del self._buffer[:2]
+            return {}
+
+        end = await self._find(_CRLF + _CRLF, limit=self._max_header_size)
+        lines = self._buffer[:end].decode("latin-1").split("\r\n")
+        del self._buffer[: end + 4]
+
+        headers = {}
+        for line in lines:
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise _malformed(f"Invalid header line: {line!r}")
+            headers[name.strip().lower()] = value.strip()
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[Part]:
+        await self._skip_preamble()
+        while True:
+            await self._require(2)
+            if self._buffer.startswith(b"--"):
+                # Closing boundary. The epilogue is ignored.
+                return
+
+            # Skip transport padding after the boundary.
+            end = await self._find(_CRLF, limit=self._max_header_size)
+            if self._buffer[:end].strip(b" \t"):
+                raise _malformed("Invalid boundary line")
+            del self._buffer[: end + 2]
+
+            headers = await self._read_headers()
+            self._part_done = False
+            yield Part(headers, self)
+
+            # Skip what the consumer did not read.
+            while not self._part_done:
+                await self.read_chunk()
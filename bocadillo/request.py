@@ -1,26 +1,311 @@
-from json import JSONDecodeError
+from tempfile import SpooledTemporaryFile
+from typing import Any, AsyncIterator, Optional
 
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request as _Request
 
+from .json_engines import STDLIB, JSONEngine
+from .json_stream import JSONStreamTooLarge, MalformedJSON, iter_json
+from .media import Media, UnsupportedMediaType
+from .multipart import (
+    DEFAULT_CHUNK_SIZE,
+    MultipartParser,
+    Part,
+    parse_options_header,
+)
+
+_NOT_DECODED = object()
+
 
 class Request(_Request):
-    """The succulent request object."""
+    """The succulent request object.
+
+    # Parameters
+    scope (dict): the ASGI scope.
+    receive (callable): the ASGI receive channel.
+    json_engine (JSONEngine):
+        used to parse the request body as JSON.
+        Defaults to the standard library's `json` module.
+    media (Media):
+        used to decode the request body in [media](#media).
+        Defaults to the built-in media decoders.
+    max_body_size (int):
+        the maximum size of the request body, in bytes.
+        Defaults to `None` (no limit). See also
+        [limit_body_size](#limit-body-size).
+    """
+
+    def __init__(
+        self,
+        scope,
+        receive=None,
+        json_engine: JSONEngine = STDLIB,
+        media: Media = None,
+        max_body_size: Optional[int] = None,
+    ):
+        super().__init__(scope, receive)
+        self._json_loads = json_engine.loads
+        self._media = media
+        self._media_value = _NOT_DECODED
+        self._max_body_size: Optional[int] = None
+        self._body_received = 0
+        self._spooled_body: Optional[SpooledTemporaryFile] = None
+        if max_body_size is not None:
+            self._set_max_body_size(max_body_size)
+
+    @property
+    def max_body_size(self) -> Optional[int]:
+        """The maximum size of the request body, in bytes, if any."""
+        return self._max_body_size
+
+    def _set_max_body_size(self, max_body_size: int):
+        if self._max_body_size is None:
+            # Count received bytes from now on.
+            self._receive_unlimited = self._receive
+            self._receive = self._receive_limited
+        self._max_body_size = max_body_size
+
+    def limit_body_size(self, max_body_size: int):
+        """Limit the size of the request body.
+
+        The `Content-Length` header is checked right away, and bytes are
+        counted as the body is received (e.g. in `body()`, `json()` or
+        `stream()`), so that reading stops as soon as the limit is
+        exceeded.
+
+        # Parameters
+        max_body_size (int): a number of bytes. Replaces any previous limit.
+
+        # Raises
+        HTTPError(413):
+            if the body is larger than `max_body_size`, either according to
+            `Content-Length` or once it has been received.
+        """
+        from .errors import HTTPError  # prevent circular imports
+
+        content_length = self.headers.get("content-length")
+        if content_length is not None:
+            try:
+                too_large = int(content_length) > max_body_size
+            except ValueError:
+                raise HTTPError(400, detail="Invalid Content-Length.")
+            if too_large:
+                raise HTTPError(413)
+
+        self._set_max_body_size(max_body_size)
+
+    async def _receive_limited(self):
+        message = await self._receive_unlimited()
+        if message["type"] == "http.request":
+            self._body_received += len(message.get("body", b""))
+            if self._body_received > self._max_body_size:
+                from .errors import HTTPError  # prevent circular imports
+
+                raise HTTPError(413)
+        return message
 
     async def json(self):
         """Parse the request body as JSON.
 
         # Returns
-        json (dict): the result of `json.loads(await self.body())`.
+        json (dict): the result of `json_engine.loads(await self.body())`.
+
+        # Raises
+        HTTPError(400): if the JSON is malformed.
+        """
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            try:
+                self._json = self._json_loads(body)
+            except ValueError:  # includes `json.JSONDecodeError`
+                from .errors import HTTPError  # prevent circular imports
+
+                raise HTTPError(400, detail="JSON is malformed.")
+        return self._json
+
+    async def iter_json(
+        self,
+        path: str = "item",
+        max_item_size: Optional[int] = 1024 * 1024,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """Parse values out of a JSON request body as it is received.
+
+        Unlike [json](#json), the body is not loaded in memory: only the
+        value being parsed is buffered.
+
+        # Parameters
+        path (str):
+            The location of the values to yield, as dot-separated object
+            keys, where `item` refers to the items of an array.
+            For example, `"item"` (the default) yields the items of a
+            top-level array, and `"items.item"` yields the items of the
+            array located at the `"items"` key of a top-level object.
+        max_item_size (int):
+            The maximum size of a value, in bytes. Defaults to 1 MiB.
+        limit (int):
+            The maximum size of the request body, in bytes.
+            Defaults to `None` (no limit).
 
         # Raises
         HTTPError(400): if the JSON is malformed.
+        HTTPError(413): if `limit` or `max_item_size` is exceeded.
+
+        # Example
+
+        ```python
+        async for item in req.iter_json("items.item"):
+            ...
+        ```
         """
+        from .errors import HTTPError  # prevent circular imports
+
+        values = iter_json(
+            self.stream(),
+            path=path,
+            loads=self._json_loads,
+            max_item_size=max_item_size,
+            limit=limit,
+        )
         try:
-            return await super().json()
-        except JSONDecodeError:
+            async for value in values:
+                yield value
+        except MalformedJSON:
+            raise HTTPError(400, detail="JSON is malformed.")
+        except JSONStreamTooLarge:
+            raise HTTPError(413)
+
+    async def spooled_body(
+        self,
+        max_memory: int = 1024 * 1024,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> SpooledTemporaryFile:
+        """Read the request body into a spooled temporary file.
+
+        The body is kept in memory until it exceeds `max_memory`, at
+        which point it is moved to a temporary file on disk. The result
+        is memoized.
+
+        # Parameters
+        max_memory (int):
+            the maximum number of bytes kept in memory. Defaults to 1 MiB.
+        chunk_size (int):
+            received bytes are buffered until this number of bytes is
+            reached before being written to the file, which limits the
+            number of system calls. Defaults to 64 KiB.
+
+        # Returns
+        file (SpooledTemporaryFile):
+            a binary file-like object, positioned at the start of the body.
+            It is deleted once closed.
+        """
+        if self._spooled_body is None:
+            file = SpooledTemporaryFile(max_size=max_memory)
+
+            async def write(data: bytearray):
+                # Writes which roll the file over to disk, or happen after
+                # it has been rolled over, are blocking I/O.
+                if file._rolled or file.tell() + len(data) > max_memory:
+                    await run_in_threadpool(file.write, data)
+                else:
+                    file.write(data)
+
+            buffer = bytearray()
+            async for chunk in self.stream():
+                buffer += chunk
+                if len(buffer) >= chunk_size:
+                    await write(buffer)
+                    buffer = bytearray()
+            if buffer:
+                await write(buffer)
+            file.seek(0)
+            self._spooled_body = file
+        return self._spooled_body
+
+    async def iter_multipart(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[Part]:
+        """Parse a `multipart/form-data` body as it is received.
+
+        Parts are yielded one at a time along with their own async reader,
+        which means that files are never fully loaded in memory.
+        Parts must be consumed in order.
+
+        # Parameters
+        chunk_size (int):
+            the minimum size of chunks read from parts (except the last
+            chunk of each part). Defaults to 64 KiB.
+
+        # Raises
+        HTTPError(415): if the request does not have a multipart body.
+        HTTPError(400): if the body is malformed.
+
+        # Example
+
+        ```python
+        async for part in req.iter_multipart():
+            if part.filename is None:
+                value = await part.read()
+            else:
+                async for chunk in part:
+                    ...
+        ```
+
+        # See Also
+        - [Part](./multipart.md#part)
+        """
+        from .errors import HTTPError  # prevent circular imports
+
+        content_type, params = parse_options_header(
+            self.headers.get("content-type", "")
+        )
+        boundary = params.get("boundary")
+        if content_type != "multipart/form-data" or not boundary:
+            raise HTTPError(415)
+
+        parser = MultipartParser(
+            self.stream(), boundary.encode("latin-1"), chunk_size=chunk_size
+        )
+        async for part in parser:
+            yield part
+
+    async def media(self) -> Any:
+        """Decode the request body according to its `Content-Type`.
+
+        The decoder is picked from the application's media decoders.
+        If the request has no `Content-Type`, the application's media
+        type is assumed. The result is memoized, so the body is only
+        decoded once per request.
+
+        # Returns
+        value (any): the decoded request body.
+
+        # Raises
+        HTTPError(415): if no decoder exists for the request's content type.
+        HTTPError(400): if the body is malformed.
+        """
+        if self._media_value is _NOT_DECODED:
             from .errors import HTTPError  # prevent circular imports
 
-            raise HTTPError(400, detail="JSON is malformed.")
+            media = self._media
+            if media is None:
+                media = self._media = Media(Media.JSON)
+
+            content_type = self.headers.get("content-type")
+            if content_type is None:
+                media_type = media.type
+            else:
+                media_type = content_type.partition(";")[0].strip().lower()
+
+            body = await self.body()
+            try:
+                self._media_value = media.deserialize(body, media_type)
+            except UnsupportedMediaType:
+                raise HTTPError(415)
+            except ValueError:
+                raise HTTPError(400, detail=f"Malformed {media_type} body.")
+
+        return self._media_value
 
     async def __aiter__(self):
         async for chunk in self.stream():
@@ -1,44 +1,136 @@
 import inspect
-from typing import AnyStr, Any, Callable, Coroutine, Optional, AsyncIterable
+import os
+from typing import (
+    AnyStr,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    AsyncIterable,
+    Iterable,
+    Tuple,
+    Union,
+)
 
 from starlette.background import BackgroundTask
 from starlette.requests import Request
-from starlette.responses import (
-    Response as _Response,
-    StreamingResponse as _StreamingResponse,
-)
 
-from .media import Media
+from .media import Content, Media
 
 BackgroundFunc = Callable[..., Coroutine]
 StreamFunc = Callable[[], AsyncIterable[AnyStr]]
+RawHeaders = List[Tuple[bytes, bytes]]
+
+NDJSON = "application/x-ndjson"
+# Formats supported by `Response.stream_media()`, with their content type.
+STREAM_FORMATS = {"ndjson": NDJSON, "json-array": Media.JSON}
+
+# Pre-encoded header names and values shared by all responses.
+CONTENT_TYPE = b"content-type"
+CONTENT_LENGTH = b"content-length"
+_HEADER_NAMES: Dict[str, bytes] = {
+    "content-type": CONTENT_TYPE,
+    "content-length": CONTENT_LENGTH,
+    "transfer-encoding": b"transfer-encoding",
+    "vary": b"vary",
+}
+_HEADER_VALUES: Dict[str, bytes] = {
+    Media.JSON: b"application/json",
+    Media.PLAIN_TEXT: b"text/plain",
+    Media.HTML: b"text/html",
+    Media.MSGPACK: b"application/msgpack",
+    Media.CBOR: b"application/cbor",
+    NDJSON: b"application/x-ndjson",
+    "Accept": b"Accept",
+    "chunked": b"chunked",
+}
+# Header names are set by application code, so only a few of them
+# are expected. This is a safety net in case they are generated.
+_MAX_CACHED_HEADER_NAMES = 256
+
+
+def encode_headers(headers: Dict[str, str]) -> RawHeaders:
+    """Encode headers as a list of `(name, value)` byte strings.
+
+    Header names are lower-cased. Encoded names and common values
+    (e.g. content types) are cached.
+
+    # Parameters
+    headers (dict): a mapping of header names to values.
+
+    # Returns
+    raw_headers (list of tuples): headers in the format expected by ASGI.
+    """
+    raw_headers = []
+    for name, value in headers.items():
+        raw_name = _HEADER_NAMES.get(name)
+        if raw_name is None:
+            raw_name = name.lower().encode("latin-1")
+            if len(_HEADER_NAMES) < _MAX_CACHED_HEADER_NAMES:
+                _HEADER_NAMES[name] = raw_name
+        raw_value = _HEADER_VALUES.get(value)
+        if raw_value is None:
+            raw_value = value.encode("latin-1")
+        raw_headers.append((raw_name, raw_value))
+    return raw_headers
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterable[Any]:
+    for item in items:
+        yield item
 
 
 class Response:
-    """Response builder."""
+    """Response builder.
 
-    CONTENT_ATTRS = {
-        "text": Media.PLAIN_TEXT,
-        "html": Media.HTML,
-        "media": None,
-    }
+    Use the `text`, `html` and `media` attributes to set the content of the
+    response along with the appropriate content type, or `content` to
+    set the raw content.
+
+    # Attributes
+    request (Request): the request being responded to.
+    status_code (int): the response status code. Defaults to `200`.
+    headers (dict): the response headers.
+    chunked (bool):
+        whether to send the response using `transfer-encoding: chunked`.
+    """
+
+    __slots__ = (
+        "request",
+        "status_code",
+        "headers",
+        "chunked",
+        "_content",
+        "_media",
+        "_background",
+        "_generator",
+        "_file",
+    )
 
     def __init__(self, request: Request, media: Media):
         self.request = request
-        self._content: AnyStr = None
         self.status_code: int = None
         self.headers = {}
+        self.chunked = False
+        self._content: Content = None
         self._media = media
         self._background: BackgroundFunc = None
         self._generator: AsyncIterable[bytes] = None
-        self.chunked = False
+        self._file = None
 
     @property
-    def content(self) -> Optional[AnyStr]:
+    def content(self) -> Optional[Content]:
+        """Get or set the raw content of the response.
+
+        This can be `str` (encoded to UTF-8), or `bytes`, `bytearray` or
+        `memoryview`, which are sent as is.
+        """
         return self._content
 
     @content.setter
-    def content(self, content: AnyStr):
+    def content(self, content: Content):
         self._content = content
 
     def _set_media(self, value: Any, media_type: str):
@@ -46,12 +138,43 @@ class Response:
         self.headers["content-type"] = media_type
         self._content = content
 
-    def __setattr__(self, key, value):
-        if key in self.CONTENT_ATTRS:
-            media_type = self.CONTENT_ATTRS[key] or self._media.type
-            self._set_media(value, media_type=media_type)
+    def _set_text(self, value: str):
+        self._set_media(value, media_type=Media.PLAIN_TEXT)
+
+    def _set_html(self, value: str):
+        self._set_media(value, media_type=Media.HTML)
+
+    def _add_vary(self, header: str):
+        # Extend an existing `Vary` header, whatever the case of its name.
+        for name, value in self.headers.items():
+            if name.lower() == "vary":
+                break
+        else:
+            self.headers["vary"] = header
+            return
+        values = {item.strip().lower() for item in value.split(",")}
+        if "*" not in values and header.lower() not in values:
+            self.headers[name] = f"{value}, {header}"
+
+    def _set_media_value(self, value: Any):
+        media = self._media
+        if media.negotiation:
+            media_type = media.negotiate(self.request.headers.get("accept"))
+            self._add_vary("Accept")
         else:
-            super().__setattr__(key, value)
+            media_type = media.type
+        self._set_media(value, media_type=media_type)
+
+    # NOTE: these attributes are write-only.
+    text = property(fset=_set_text, doc="Set plain text content.")
+    html = property(fset=_set_html, doc="Set HTML content.")
+    media = property(
+        fset=_set_media_value,
+        doc=(
+            "Set content serialized using the API's media type, or the "
+            "media type negotiated from the request's `Accept` header."
+        ),
+    )
 
     def background(self, func: BackgroundFunc, *args, **kwargs):
         """Register a coroutine function to be executed in the background."""
@@ -78,28 +201,182 @@ class Response:
         self._generator = func()
         return func
 
+    def stream_media(
+        self,
+        items: Union[AsyncIterable[Any], Iterable[Any]],
+        format: str = "ndjson",
+        chunk_size: int = 16384,
+    ):
+        """Stream a sequence of values serialized as JSON.
+
+        Values are serialized one at a time using the JSON media handler
+        (see [JSON engines](../guides/http/media.md#json-engines)), so
+        memory usage does not depend on the number of values.
+
+        # Parameters
+        items (async iterable or iterable): the values to send.
+        format (str):
+            Either `"ndjson"` (one JSON value per line, sent as
+            `application/x-ndjson`) or `"json-array"` (a single JSON array,
+            sent as `application/json`). Defaults to `"ndjson"`.
+        chunk_size (int):
+            Serialized values are buffered until this number of bytes is
+            reached before being sent, which reduces the number of ASGI
+            messages for small values. Defaults to `16384`.
+
+        # Raises
+        ValueError: if `format` is not supported.
+        """
+        try:
+            content_type = STREAM_FORMATS[format]
+        except KeyError:
+            raise ValueError(
+                f"Unsupported stream format: {format!r} "
+                f"(expected one of: {', '.join(STREAM_FORMATS)})"
+            ) from None
+
+        self.headers["content-type"] = content_type
+        self._generator = self._serialize_stream(
+            items, array=format == "json-array", chunk_size=chunk_size
+        )
+
+    async def _serialize_stream(
+        self, items, array: bool, chunk_size: int
+    ) -> AsyncIterable[bytearray]:
+        if not hasattr(items, "__aiter__"):
+            items = _aiter(items)
+
+        serialize = self._media.handlers[Media.JSON]
+        separator = b"," if array else b"\n"
+        buffer = bytearray(b"[" if array else b"")
+        first = True
+
+        async for item in items:
+            if array and not first:
+                buffer += separator
+            first = False
+
+            data = serialize(item)
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            buffer += data
+            if not array:
+                buffer += separator
+
+            if len(buffer) >= chunk_size:
+                # NOTE: a new buffer is created instead of clearing it
+                # because chunks are sent without being copied.
+                yield buffer
+                buffer = bytearray()
+
+        if array:
+            buffer += b"]"
+        if buffer:
+            yield buffer
+
+    def file(self, path: str):
+        """Send a file.
+
+        The file is streamed from disk, using the `http.response.zerocopysend`
+        ASGI extension if the server supports it. Its content type is
+        guessed from `path`, and `Content-Length`, `Last-Modified` and
+        `ETag` headers are set. Headers set on the response take precedence.
+
+        If the response status code is 200 (the default), conditional
+        requests (`If-None-Match` and `If-Modified-Since`) result in
+        `304 Not Modified` responses and range requests (`Range` and
+        `If-Range`) result in `206 Partial Content` responses.
+
+        # Parameters
+        path (str): the path to a file.
+
+        # Raises
+        FileNotFoundError: if the file does not exist.
+
+        # See Also
+        - [send_file](./staticfiles.md#send-file)
+        """
+        from .staticfiles import StaticFile  # prevent circular imports
+
+        self._file = StaticFile(path, os.stat(path))
+
+    def _get_body(self) -> Tuple[Union[bytes, bytearray, memoryview], int]:
+        # Return the body and its size in bytes.
+        # NOTE: binary content is not copied.
+        content = self._content
+        if content is None:
+            return b"", 0
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        elif isinstance(content, memoryview):
+            return content, content.nbytes
+        return content, len(content)
+
     async def __call__(self, receive, send):
-        """Build and send the response."""
+        """Build and send the response.
+
+        ASGI messages are sent directly, i.e. without building an
+        intermediate Starlette response.
+        """
         if self.status_code is None:
             self.status_code = 200
 
+        if self._file is not None:
+            from .staticfiles import send_file  # prevent circular imports
+
+            # NOTE: requests are mappings of their ASGI scope.
+            await send_file(
+                self._file,
+                self.request,
+                send,
+                status_code=self.status_code,
+                headers=encode_headers(self.headers),
+            )
+        else:
+            await self._send_content(send)
+
+        if self._background is not None:
+            await self._background()
+
+    async def _send_content(self, send):
+        headers = self.headers
         if self.status_code != 204:
-            self.headers.setdefault("content-type", Media.PLAIN_TEXT)
+            headers.setdefault("content-type", Media.PLAIN_TEXT)
 
         if self.chunked:
-            self.headers["transfer-encoding"] = "chunked"
+            headers["transfer-encoding"] = "chunked"
+
+        raw_headers = encode_headers(headers)
 
-        if self._generator is not None:
-            response_cls = _StreamingResponse
-            content = self._generator
+        if self._generator is None:
+            body, size = self._get_body()
+            # NOTE: raw header names are lower-cased, unlike `headers`.
+            if size and all(name != CONTENT_LENGTH for name, _ in raw_headers):
+                raw_headers.append((CONTENT_LENGTH, str(size).encode()))
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": raw_headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
         else:
-            response_cls = _Response
-            content = self.content
-
-        response = response_cls(
-            content=content,
-            headers=self.headers,
-            status_code=self.status_code,
-            background=self.background_task,
-        )
-        await response(receive, send)
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": raw_headers,
+                }
+            )
+            async for chunk in self._generator:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": True,
+                    }
+                )
+            await send({"type": "http.response.body", "body": b""})
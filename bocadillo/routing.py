@@ -1,21 +1,92 @@
 import inspect
-from functools import partial
-from typing import Callable, Union, Type, Any
-from typing import Optional, TypeVar, Generic, Dict
+import re
+from functools import partial, lru_cache
+from string import Formatter
+from typing import Callable, Union, Type, Any, List, Sequence, Tuple
+from typing import Optional, TypeVar, Generic, Dict, Pattern
 
-from parse import parse
+from parse import compile as compile_pattern
 from starlette.websockets import WebSocketClose
 
 from . import views
 from .app_types import HTTPApp
 from .app_types import Scope, Receive, Send
+from .constants import ALL_HTTP_METHODS
 from .errors import HTTPError
+from .executors import PROCESS, Executors
+from .json_engines import JSONEngine
 from .redirection import Redirection
 from .request import Request
 from .response import Response
 from .views import View, HandlerDoesNotExist
 from .websockets import WebSocketView, WebSocket
 
+# URL building
+
+_INT_FORMAT_TYPES = set("dbox")
+_FLOAT_FORMAT_TYPES = set("fFeEgG%")
+
+
+def _get_converter(spec: str) -> Callable[[Any], str]:
+    # Return a function which formats a route parameter according to
+    # the format specifier of its field in the URL pattern.
+    if spec:
+        for format_types, cast in (
+            (_INT_FORMAT_TYPES, int),
+            (_FLOAT_FORMAT_TYPES, float),
+        ):
+            if spec[-1] not in format_types:
+                continue
+            try:
+                format(cast(0), spec)
+            except ValueError:
+                break
+            return lambda value: format(cast(value), spec)
+    # NOTE: other specifiers (e.g. `w` or `ti`) are only meaningful
+    # to `parse`, so the value is used as is.
+    return str
+
+
+def compile_url_builder(pattern: str) -> Callable[..., str]:
+    """Compile a function which builds URL paths for an URL pattern.
+
+    The URL pattern is split into literal parts and parameter fields once
+    and for all. Parameters are then formatted according to the type of
+    their field, e.g. `int` for `{id:d}`.
+
+    # Parameters
+    pattern (str): an URL pattern.
+
+    # Returns
+    build (callable):
+        a function which accepts route parameters as keyword arguments and
+        returns a full URL path.
+    """
+    template = ""
+    fields = []
+
+    for literal, name, spec, conversion in Formatter().parse(pattern):
+        template += literal.replace("{", "{{").replace("}", "}}")
+        if name is None:
+            continue
+        if conversion is not None or not name.isidentifier():
+            # Unusual field. Let `str.format()` deal with it.
+            return pattern.format
+        template += "{}"
+        fields.append((name, _get_converter(spec)))
+
+    if not fields:
+        # No parameters: the URL path is always the same.
+        url = template.format()
+        return lambda **kwargs: url
+
+    def build(**kwargs) -> str:
+        return template.format(
+            *[convert(kwargs[name]) for name, convert in fields]
+        )
+
+    return build
+
 
 # Base classes
 
@@ -25,12 +96,20 @@ class BaseRoute:
 
     # Parameters
     pattern (str): an URL pattern.
+
+    # Attributes
+    static (bool):
+        Whether the URL pattern has no route parameters, i.e. only matches
+        the URL path equal to the pattern itself.
     """
 
     def __init__(self, pattern: str):
         if not pattern.startswith("/"):
             pattern = f"/{pattern}"
         self._pattern = pattern
+        self._parser = compile_pattern(pattern)
+        self._build_url = compile_url_builder(pattern)
+        self.static = "{" not in pattern and "}" not in pattern
 
     def url(self, **kwargs) -> str:
         """Return full path for the given route parameters.
@@ -42,8 +121,11 @@ class BaseRoute:
         url (str):
             A full URL path obtained by formatting the route pattern with
             the provided route parameters.
+
+        # See Also
+        - [compile_url_builder](#compile-url-builder)
         """
-        return self._pattern.format(**kwargs)
+        return self._build_url(**kwargs)
 
     def parse(self, path: str) -> Optional[dict]:
         """Parse an URL path against the route's URL pattern.
@@ -53,7 +135,7 @@ class BaseRoute:
             If the URL path matches the URL pattern, this is a dictionary
             containing the route parameters, otherwise None.
         """
-        result = parse(self._pattern, path)
+        result = self._parser.parse(path)
         if result is not None:
             return result.named
         return None
@@ -78,16 +160,246 @@ class RouteMatch(Generic[_R]):
         self.params = params
 
 
+class RoutingEngine(Generic[_R]):
+    """The base routing engine class.
+
+    A routing engine is responsible for finding which route matches an URL
+    path. It is (re)built from the router's routes whenever they change.
+    """
+
+    def build(self, routes: Sequence[_R]):
+        """Prepare the engine for matching against the given routes.
+
+        # Parameters
+        routes (list): route objects, in order of registration.
+        """
+        raise NotImplementedError
+
+    def match(self, path: str) -> Optional[RouteMatch[_R]]:
+        """Attempt to match an URL path against one of the routes."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """Return engine-specific statistics about the routing table."""
+        return {}
+
+
+class LinearEngine(RoutingEngine[_R]):
+    """Try each route in order of registration until one matches.
+
+    This is the default routing engine.
+    """
+
+    def __init__(self):
+        self._routes: List[_R] = []
+
+    def build(self, routes: Sequence[_R]):
+        self._routes = list(routes)
+
+    def match(self, path: str) -> Optional[RouteMatch[_R]]:
+        for route in self._routes:
+            params = route.parse(path)
+            if params is not None:
+                return RouteMatch(route=route, params=params)
+        return None
+
+
+# Matches the start of named groups and backreferences in a regex.
+_NAMED_GROUP_REGEX = re.compile(r"\(\?P([<=])")
+
+
+class RegexEngine(RoutingEngine[_R]):
+    """Match all routes at once using a single combined regular expression.
+
+    Each route's pattern is compiled into an alternative of the combined
+    regex. When a path matches, the name of the outermost matching group
+    tells which route matched, and only that route extracts parameters.
+    Because alternatives are tried in order, the first registered route
+    still wins.
+    """
+
+    def __init__(self):
+        self._regex: Optional[Pattern] = None
+        self._dispatch: Dict[str, _R] = {}
+
+    def build(self, routes: Sequence[_R]):
+        self._dispatch = {}
+        alternatives = []
+        flags = 0
+
+        for index, route in enumerate(routes):
+            group = f"_r{index}"
+            # Prefix named groups to prevent collisions between routes.
+            expression = _NAMED_GROUP_REGEX.sub(
+                rf"(?P\1{group}_", route._parser._expression
+            )
+            alternatives.append(f"(?P<{group}>{expression})")
+            flags |= route._parser._re_flags
+            self._dispatch[group] = route
+
+        if alternatives:
+            combined = "^(?:" + "|".join(alternatives) + ")$"
+            self._regex = re.compile(combined, flags)
+        else:
+            self._regex = None
+
+    def match(self, path: str) -> Optional[RouteMatch[_R]]:
+        if self._regex is None:
+            return None
+        match = self._regex.match(path)
+        if match is None:
+            return None
+        route = self._dispatch[match.lastgroup]
+        return RouteMatch(route=route, params=route.parse(path))
+
+
+class _TrieNode:
+    # A node of the trie, i.e. a static path segment.
+
+    __slots__ = ("children", "static", "dynamic")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # `(index, route)` of the first route whose pattern ends here.
+        self.static: Optional[tuple] = None
+        # `(index, route)` of routes whose static prefix ends here.
+        self.dynamic: List[tuple] = []
+
+
+def _split_segments(pattern_or_path: str) -> List[str]:
+    # NOTE: URL patterns are matched case-insensitively.
+    return pattern_or_path.lower().split("/")
+
+
+class TrieEngine(RoutingEngine[_R]):
+    """Match routes using a prefix tree of static path segments.
+
+    URL patterns are split on `/`. Static segments are stored as children
+    of the tree, and the rest of the pattern (starting at the first segment
+    which contains a parameter) is only evaluated once the path has been
+    walked down the tree. This means the cost of matching depends on the
+    depth of the path rather than on the number of routes.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def build(self, routes: Sequence[_R]):
+        self._root = _TrieNode()
+
+        for index, route in enumerate(routes):
+            node = self._root
+            for segment in _split_segments(route._pattern):
+                if "{" in segment or "}" in segment:
+                    node.dynamic.append((index, route))
+                    break
+                node = node.children.setdefault(segment, _TrieNode())
+            else:
+                if node.static is None:
+                    node.static = (index, route)
+
+    def match(self, path: str) -> Optional[RouteMatch[_R]]:
+        node = self._root
+        candidates = []
+
+        for segment in _split_segments(path):
+            candidates += node.dynamic
+            node = node.children.get(segment)
+            if node is None:
+                break
+        else:
+            if node.static is not None:
+                candidates.append(node.static)
+
+        # Preserve the order of registration between candidates.
+        for _, route in sorted(candidates, key=lambda candidate: candidate[0]):
+            params = route.parse(path)
+            if params is not None:
+                return RouteMatch(route=route, params=params)
+
+        return None
+
+    def stats(self) -> dict:
+        nodes = 0
+        depth = 0
+        stack = [(self._root, 0)]
+        while stack:
+            node, node_depth = stack.pop()
+            nodes += 1
+            depth = max(depth, node_depth)
+            stack.extend(
+                (child, node_depth + 1) for child in node.children.values()
+            )
+        return {"nodes": nodes, "depth": depth}
+
+
+ENGINES = {"linear": LinearEngine, "regex": RegexEngine, "trie": TrieEngine}
+
+
+def get_engine(name: str) -> RoutingEngine:
+    """Build a routing engine from its name.
+
+    # Parameters
+    name (str): one of `"linear"`, `"regex"` or `"trie"`.
+
+    # Returns
+    engine (RoutingEngine): a routing engine object.
+
+    # Raises
+    ValueError: if no routing engine exists for the given `name`.
+    """
+    try:
+        engine_cls = ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown routing engine: {name} "
+            f"(available: {', '.join(ENGINES)})"
+        ) from None
+    return engine_cls()
+
+
 class BaseRouter(Generic[_R]):
     """The base router class.
 
+    # Parameters
+    engine (str):
+        The name of the routing engine used to match URL paths.
+        Defaults to `"linear"`.
+    cache_size (int):
+        If given, the results of `match()` for the `cache_size` most
+        recently used URL paths are kept in a LRU cache. The cache is
+        cleared when a route is added.
+        Defaults to `None` (no caching).
+
+    Routes without parameters (see `BaseRoute.static`) are also stored
+    in a table keyed by URL pattern, which is looked up before the routing
+    engine is used. Static routes whose pattern is matched by a route with
+    parameters registered before them are left to the routing engine, so
+    that the first registered route always wins.
+
     # Attributes
     routes (dict):
         A mapping of patterns to route objects.
+        Use `add_route()` instead of modifying this directly, so that
+        the routing engine can be kept up to date.
     """
 
-    def __init__(self):
+    def __init__(self, engine: str = "linear", cache_size: int = None):
         self.routes: Dict[str, _R] = {}
+        self._static_routes: Dict[str, _R] = {}
+        self._engine_name = engine
+        self._engine: RoutingEngine[_R] = get_engine(engine)
+        self._engine_stale = False
+        self._cached_match = None
+        if cache_size is not None:
+            self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _store(self, key: str, route: _R):
+        # Store a route and schedule a rebuild of the routing tables.
+        self.routes[key] = route
+        self._engine_stale = True
+        if self._cached_match is not None:
+            self._cached_match.cache_clear()
 
     def add_route(self, *args, **kwargs):
         """Register a route. Not implemented."""
@@ -108,11 +420,171 @@ class BaseRouter(Generic[_R]):
             a `RouteMatch` object if the path matched a registered route,
             `None` otherwise.
         """
-        for route in self.routes.values():
-            params = route.parse(path)
-            if params is not None:
-                return RouteMatch(route=route, params=params)
-        return None
+        if self._cached_match is None:
+            return self._match(path)
+
+        match = self._cached_match(path)
+        if match is None:
+            return None
+        # Copy parameters so that the cached ones cannot be modified.
+        return RouteMatch(route=match.route, params=dict(match.params))
+
+    def _match(self, path: str) -> Optional[RouteMatch[_R]]:
+        engine = self._get_engine()
+
+        # NOTE: URL patterns are matched case-insensitively.
+        route = self._static_routes.get(path.lower())
+        if route is not None:
+            return RouteMatch(route=route, params={})
+
+        return engine.match(path)
+
+    def _get_engine(self) -> RoutingEngine[_R]:
+        if self._engine_stale:
+            self._build()
+            self._engine_stale = False
+        return self._engine
+
+    def _build(self):
+        routes = list(self.routes.values())
+        self._engine.build([route for route in routes if not route.static])
+
+        # A static route is only looked up in the table if no route with
+        # parameters registered before it matches its pattern, so that
+        # the first registered route always wins.
+        order = {id(route): index for index, route in enumerate(routes)}
+        static_routes = {}
+        shadowed = set()
+        for index, route in enumerate(routes):
+            if not route.static:
+                continue
+            match = self._engine.match(route._pattern)
+            if match is not None and order[id(match.route)] < index:
+                shadowed.add(id(route))
+                continue
+            static_routes.setdefault(route._pattern.lower(), route)
+        self._static_routes = static_routes
+
+        if shadowed:
+            self._engine.build(
+                [
+                    route
+                    for route in routes
+                    if not route.static or id(route) in shadowed
+                ]
+            )
+
+    def stats(self) -> dict:
+        """Return statistics about the routing table.
+
+        # Returns
+        stats (dict):
+            Contains the name of the routing `engine` and the number of
+            `routes`, plus any engine-specific statistics. For example,
+            the `"trie"` engine reports the number of `nodes` and the
+            `depth` of the tree.
+            If caching is enabled, `cache` contains the number of cache
+            `hits` and `misses`, and the current and maximum cache `size`.
+        """
+        stats = {
+            "engine": self._engine_name,
+            "routes": len(self.routes),
+            **self._get_engine().stats(),
+        }
+        if self._cached_match is not None:
+            info = self._cached_match.cache_info()
+            stats["cache"] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "maxsize": info.maxsize,
+            }
+        return stats
+
+
+# Mounted apps
+
+
+class _MountNode:
+    # A node of the mount tree, i.e. a path segment.
+
+    __slots__ = ("children", "mount")
+
+    def __init__(self):
+        self.children: Dict[str, "_MountNode"] = {}
+        # `(prefix, app)` if an app is mounted at this node.
+        self.mount: Optional[Tuple[str, Any]] = None
+
+
+class MountRouter:
+    """A router for apps mounted at a path prefix.
+
+    Prefixes are stored in a tree of path segments, which means that:
+
+    - Lookups are performed in `O(depth)` of the requested path.
+    - Prefixes only match whole segments, e.g. `/static` matches
+    `/static/styles.css` but not `/staticfiles/styles.css`.
+    - If multiple prefixes match, the longest one wins.
+
+    Lookup results are kept in a LRU cache of size `cache_size`, which is
+    cleared when an app is mounted. Results are cached per path prefix
+    of the same depth as the deepest mount prefix, e.g. `/static` for
+    `/static/css/styles.css` if apps are only mounted at one level.
+
+    # Parameters
+    cache_size (int): defaults to `1024`.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self._root = _MountNode()
+        self._depth = 0
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    @staticmethod
+    def _split(prefix_or_path: str) -> List[str]:
+        return prefix_or_path.rstrip("/").split("/")[1:]
+
+    def add(self, prefix: str, app: Any):
+        """Mount an app at the given prefix.
+
+        # Parameters
+        prefix (str): a path prefix starting with `/`.
+        app (any): the mounted app.
+        """
+        node = self._root
+        segments = self._split(prefix)
+        for segment in segments:
+            node = node.children.setdefault(segment, _MountNode())
+        node.mount = (prefix.rstrip("/"), app)
+        self._depth = max(self._depth, len(segments))
+        self._cached_match.cache_clear()
+
+    def match(self, path: str) -> Optional[Tuple[str, Any]]:
+        """Find the app mounted at the longest prefix of an URL path.
+
+        # Parameters
+        path (str): an URL path.
+
+        # Returns
+        mount (tuple or None):
+            A `(prefix, app)` tuple if an app is mounted at a prefix of the
+            path, `None` otherwise. The `prefix` has no trailing slash.
+        """
+        # NOTE: segments deeper than any prefix cannot change the result,
+        # so they are left out of the cache key.
+        segments = tuple(path.split("/", self._depth + 1)[1 : self._depth + 1])
+        return self._cached_match(segments)
+
+    def _match(self, segments: Tuple[str, ...]) -> Optional[Tuple[str, Any]]:
+        node = self._root
+        mount = node.mount
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.mount is not None:
+                mount = node.mount
+        return mount
 
 
 # HTTP
@@ -127,17 +599,38 @@ class HTTPRoute(BaseRoute):
         A `View` object.
     name (str):
         The route's name.
+    max_body_size (int):
+        If given, the maximum size of request bodies, in bytes.
+        Overrides the application's `max_body_size`.
     """
 
-    def __init__(self, pattern: str, view: View, name: str):
+    def __init__(
+        self,
+        pattern: str,
+        view: View,
+        name: str,
+        max_body_size: Optional[int] = None,
+    ):
         super().__init__(pattern)
         self._view = view
         self._name = name
+        self.max_body_size = max_body_size
 
     async def __call__(self, req: Request, res: Response, **params) -> None:
+        max_body_size = self.max_body_size
+        if max_body_size is None:
+            max_body_size = req.max_body_size
+        if max_body_size is not None:
+            # Reject large requests early, i.e. before running the view.
+            req.limit_body_size(max_body_size)
         try:
             await self._view(req, res, **params)
         except HandlerDoesNotExist as e:
+            res.headers["allow"] = ", ".join(
+                method
+                for method in ALL_HTTP_METHODS
+                if method in self._view.allowed_methods
+            )
             raise HTTPError(405) from e
 
 
@@ -147,8 +640,17 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute]):
     Extends [BaseRouter](#baserouter).
 
     Note: routes are stored by `name` instead of `pattern`.
+
+    # Parameters
+    executors (Executors):
+        If given, synchronous views are run in pools obtained from it.
+    kwargs (any): passed to `BaseRouter`.
     """
 
+    def __init__(self, executors: Executors = None, **kwargs):
+        super().__init__(**kwargs)
+        self.executors = executors
+
     def add_route(
         self,
         view: Union[View, Type[Any], Callable, Any],
@@ -156,6 +658,7 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute]):
         *,
         name: str = None,
         namespace: str = None,
+        max_body_size: int = None,
     ) -> HTTPRoute:
         """Register an HTTP route.
 
@@ -176,6 +679,8 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute]):
         pattern (str): an URL pattern.
         name (str): a route name (inferred from the view if not given).
         namespace (str): an optional route namespace.
+        max_body_size (int):
+            an optional maximum size of request bodies, in bytes.
 
         # Returns
         route (HTTPRoute): the registered route.
@@ -197,13 +702,23 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute]):
 
         assert isinstance(view, View)
 
+        if self.executors is not None:
+            if view.executor == PROCESS:
+                # Hooks are run in the default pool.
+                view.pool = self.executors.get()
+                view.process_pool = self.executors.get(PROCESS)
+            else:
+                view.pool = self.executors.get(view.executor)
+
         if name is None:
             name = view.name
         if namespace is not None:
             name = namespace + ":" + name
 
-        route = HTTPRoute(pattern=pattern, view=view, name=name)
-        self.routes[name] = route
+        route = HTTPRoute(
+            pattern=pattern, view=view, name=name, max_body_size=max_body_size
+        )
+        self._store(name, route)
 
         return route
 
@@ -254,8 +769,17 @@ class WebSocketRouter(BaseRouter[WebSocketRoute]):
     """A router for WebSocket routes.
 
     Extends [BaseRouter](#baserouter).
+
+    # Parameters
+    json_engine (JSONEngine):
+        if given, used by WebSocket objects to encode and decode JSON
+        messages.
     """
 
+    def __init__(self, json_engine: JSONEngine = None, **kwargs):
+        super().__init__(**kwargs)
+        self.json_engine = json_engine
+
     def add_route(self, pattern: str, view: WebSocketView, **kwargs):
         """Register a WebSocket route.
 
@@ -266,8 +790,10 @@ class WebSocketRouter(BaseRouter[WebSocketRoute]):
         # Returns
         route (WebSocketRoute): the registered route.
         """
+        if self.json_engine is not None:
+            kwargs.setdefault("json_engine", self.json_engine)
         route = WebSocketRoute(pattern=pattern, view=view, **kwargs)
-        self.routes[pattern] = route
+        self._store(pattern, route)
         return route
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
@@ -1,28 +1,845 @@
-from os.path import exists
+import gzip
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from collections import OrderedDict
+from functools import lru_cache, partial
+from http import HTTPStatus
+from io import BytesIO
+from typing import BinaryIO, Dict, FrozenSet, List, Optional, Tuple, Union
 
-from whitenoise import WhiteNoise
+from starlette.concurrency import run_in_threadpool
 
-from .compat import WSGIApp, empty_wsgi_app
+from .app_types import ASGIAppInstance, Receive, Scope, Send
+from .response import CONTENT_LENGTH, CONTENT_TYPE, RawHeaders, encode_headers
 
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
 
-def static(directory: str) -> WSGIApp:
-    """Return a WSGI app that serves static files under the given directory.
+# ASGI extension allowing servers to send files using `sendfile()`.
+ZERO_COPY_SEND = "http.response.zerocopysend"
+# Files are read (and sent) in chunks of this size. Files that fit
+# in a single chunk are read without going through the thread pool.
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_MAX_AGE = 60
+# Range requests with more ranges than this are served in full.
+MAX_RANGES = 16
+CONTENT_RANGE = b"content-range"
+_RANGE_SPEC = re.compile(r"(\d*)-(\d*)\Z", re.ASCII)
+# Headers sent along with `304 Not Modified` responses.
+_NOT_MODIFIED_HEADERS = frozenset(
+    (b"cache-control", b"content-location", b"etag", b"last-modified", b"vary")
+)
 
-    Powered by WhiteNoise.
+# Content codings of precompressed files, by order of preference,
+# along with the extension of these files.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# Extensions of files which are already compressed.
+COMPRESSED_EXTENSIONS = frozenset(
+    (
+        ".br",
+        ".bz2",
+        ".gif",
+        ".gz",
+        ".jpeg",
+        ".jpg",
+        ".mp3",
+        ".mp4",
+        ".png",
+        ".tgz",
+        ".webm",
+        ".webp",
+        ".woff",
+        ".woff2",
+        ".xz",
+        ".zip",
+    )
+)
+# Number of distinct `Accept-Encoding` header values whose parsed value
+# is cached.
+ACCEPT_ENCODING_CACHE_SIZE = 256
+_ARCHIVE_TYPES = {"br": "application/x-brotli", "gzip": "application/gzip"}
+
+
+def _get_content_type(path: str) -> str:
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding is not None:
+        # E.g. a precompressed file requested directly.
+        return _ARCHIVE_TYPES.get(encoding, "application/octet-stream")
+    if content_type is None:
+        return "application/octet-stream"
+    if content_type.startswith("text/"):
+        return content_type + "; charset=utf-8"
+    return content_type
+
+
+class StaticFile:
+    """Metadata about a file served by [StaticFiles](#staticfiles).
+
+    # Parameters
+    path (str): the path to the file on disk.
+    stat (os.stat_result): the result of `os.stat()` on the file.
+    max_age (int):
+        the value of the `max-age` cache directive, in seconds.
+        If not given, no `Cache-Control` header is sent.
+    content_type (str):
+        the content type of the file. Guessed from `path` if not given.
+    encoding (str):
+        the content coding of the file, if it is a precompressed variant
+        of another file, e.g. `"gzip"`.
+    variants (list of tuples):
+        precompressed variants of the file, as `(encoding, StaticFile)`
+        tuples, by order of preference.
+
+    # Attributes
+    size (int): the size of the file, in bytes.
+    mtime (float): the time of last modification of the file.
+    etag (str): an entity tag built from `size` and `mtime`.
+    headers (list of tuples):
+        raw headers sent along with the file.
+    """
+
+    __slots__ = ("path", "size", "mtime", "etag", "headers", "variants")
+
+    def __init__(
+        self,
+        path: str,
+        stat: os.stat_result,
+        max_age: int = None,
+        content_type: str = None,
+        encoding: str = None,
+        variants: List[Tuple[str, "StaticFile"]] = None,
+    ):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.etag = f'"{int(self.mtime):x}-{self.size:x}"'
+        self.variants = variants or []
+        headers = {
+            "content-type": content_type or _get_content_type(path),
+            "content-length": str(self.size),
+            "last-modified": formatdate(self.mtime, usegmt=True),
+            "etag": self.etag,
+            "accept-ranges": "bytes",
+        }
+        if max_age is not None:
+            headers["cache-control"] = f"max-age={max_age}, public"
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        if encoding is not None or self.variants:
+            # Caches must not serve a variant to clients which do not
+            # support it (or the original file to those which do).
+            headers["vary"] = "Accept-Encoding"
+        self.headers: RawHeaders = encode_headers(headers)
+
+    def select(self, accept_encoding: Optional[bytes]) -> "StaticFile":
+        """Return the preferred variant given an `Accept-Encoding` header.
+
+        # Parameters
+        accept_encoding (bytes): the value of an `Accept-Encoding` header.
+
+        # Returns
+        file (StaticFile):
+            the first variant whose encoding is accepted, or the file itself.
+        """
+        if not self.variants or not accept_encoding:
+            return self
+        accepted, rejected = parse_accept_encoding(accept_encoding)
+        for encoding, variant in self.variants:
+            if encoding in accepted or (
+                "*" in accepted and encoding not in rejected
+            ):
+                return variant
+        return self
+
+
+@lru_cache(maxsize=ACCEPT_ENCODING_CACHE_SIZE)
+def parse_accept_encoding(
+    accept_encoding: bytes,
+) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Parse an `Accept-Encoding` header.
+
+    Results are cached per distinct header value.
+
+    # Parameters
+    accept_encoding (bytes): the value of an `Accept-Encoding` header.
+
+    # Returns
+    encodings (tuple):
+        the set of accepted content codings (including `"*"`, if present),
+        and the set of explicitly rejected ones (i.e. with `q=0`).
+    """
+    accepted, rejected = set(), set()
+    for item in accept_encoding.decode("latin-1").split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        (accepted if quality > 0 else rejected).add(coding)
+    return frozenset(accepted), frozenset(rejected)
+
+
+def _get_header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+class StaticFiles:
+    """An ASGI app that serves static files under a directory.
+
+    Files are indexed when the app is created, which means that serving
+    a file requires no `stat()` call, and that files added to the
+    directory afterwards are not served.
+
+    If a file has precompressed siblings (e.g. `app.js.br` and `app.js.gz`
+    for `app.js`), the variant to serve is selected according to the
+    `Accept-Encoding` request header. Brotli is preferred over gzip.
+
+    If the server supports the `http.response.zerocopysend` ASGI extension,
+    files are handed to the server as is so that it can send them with
+    `sendfile()`. Otherwise, they are read in chunks in the thread pool,
+    so that disk I/O never blocks the event loop.
+
+    Small files (i.e. which fit in a single chunk) can be kept in a
+    least-recently-used in-memory cache, bounded by `cache_size`, so that
+    hot assets are served without any I/O.
+
+    In debug mode, files are checked for modifications on each request,
+    and cached contents are invalidated if the file has changed.
 
     # Parameters
     directory (str):
         the path to a directory from where static files should be served.
         If the directory does not exist, no files will be served.
+    chunk_size (int):
+        the size of chunks files are read in, in bytes.
+        Defaults to 256 KiB.
+    max_age (int):
+        the value of the `max-age` directive of the `Cache-Control` header,
+        in seconds. Defaults to 60.
+    cache_size (int):
+        the maximum total size of the contents of cached files, in bytes.
+        Defaults to 0 (no caching).
+    debug (bool):
+        whether to check files for modifications on each request.
+        Defaults to `False`.
+
+    # Attributes
+    files (dict):
+        a mapping of URL paths (relative to the directory, e.g.
+        `"/css/styles.css"`) to [StaticFile](#staticfile) objects.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_age: int = DEFAULT_MAX_AGE,
+        cache_size: int = 0,
+        debug: bool = False,
+    ):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.max_age = max_age
+        self.cache_size = cache_size
+        self.debug = debug
+        self.files: Dict[str, StaticFile] = {}
+        # Contents of cached files, by path, from least to most
+        # recently used.
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cached_bytes = 0
+        self.build_index()
+
+    def build_index(self):
+        """(Re)build the index of files served by the app."""
+        stats = {}
+        for root, _, filenames in os.walk(self.directory, followlinks=True):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:  # pragma: no cover
+                    # Broken symlink, or file removed in the meantime.
+                    continue
+                relpath = os.path.relpath(path, self.directory)
+                stats["/" + relpath.replace(os.sep, "/")] = (path, stat)
+
+        self.files = {url: self._create_file(url, stats) for url in stats}
+        self.clear_cache()
+
+    def _create_file(self, url: str, stats: dict) -> StaticFile:
+        # `stats` maps URL paths to `(path, stat)` tuples.
+        path, stat = stats[url]
+        content_type = _get_content_type(path)
+        variants = [
+            (
+                encoding,
+                StaticFile(
+                    *stats[url + extension],
+                    max_age=self.max_age,
+                    content_type=content_type,
+                    encoding=encoding,
+                ),
+            )
+            for encoding, extension in ENCODINGS
+            if url + extension in stats
+        ]
+        return StaticFile(
+            path,
+            stat,
+            max_age=self.max_age,
+            content_type=content_type,
+            variants=variants,
+        )
+
+    def _refresh(self, url: str, file: StaticFile) -> Optional[StaticFile]:
+        # Re-create the file (and its variants) if any of them was added,
+        # modified or deleted. Returns `None` if the file was deleted.
+        stats = {}
+        for suffix in ("", *(extension for _, extension in ENCODINGS)):
+            path = file.path + suffix
+            try:
+                stats[url + suffix] = (path, os.stat(path))
+            except OSError:
+                continue
+
+        current = {f.path: f for f in (file, *(v for _, v in file.variants))}
+        if len(stats) == len(current) and all(
+            path in current
+            and current[path].mtime == stat.st_mtime
+            and current[path].size == stat.st_size
+            for path, stat in stats.values()
+        ):
+            return file
+
+        for path in current:
+            self._evict(path)
+        if url not in stats:
+            del self.files[url]
+            return None
+        file = self.files[url] = self._create_file(url, stats)
+        return file
+
+    def clear_cache(self):
+        """Remove all files from the in-memory cache."""
+        self._cache.clear()
+        self._cached_bytes = 0
+
+    def _evict(self, path: str):
+        content = self._cache.pop(path, None)
+        if content is not None:
+            self._cached_bytes -= len(content)
+
+    async def _get_cached(self, file: StaticFile) -> Optional[bytes]:
+        # Return the contents of a file, reading and caching them
+        # if the file is small enough.
+        content = self._cache.get(file.path)
+        if content is not None:
+            self._cache.move_to_end(file.path)
+            return content
+
+        if file.size > min(self.chunk_size, self.cache_size):
+            return None
+        content = await run_in_threadpool(_read_file, file.path)
+        if content is None or len(content) != file.size:
+            # The file was removed or modified since it was indexed.
+            return None
+        if file.path in self._cache:
+            # Read concurrently by another request.
+            return self._cache[file.path]
+
+        self._cache[file.path] = content
+        self._cached_bytes += len(content)
+        while self._cached_bytes > self.cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+        return content
+
+    def __call__(self, scope: Scope) -> ASGIAppInstance:
+        return partial(self.serve, scope=scope)
+
+    async def serve(self, receive: Receive, send: Send, scope: Scope):
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await _send_error(send, 405, [(b"allow", b"GET, HEAD")])
+            return
+
+        path = scope["path"]
+        file = self.files.get(path)
+        if file is not None and self.debug:
+            file = self._refresh(path, file)
+        if file is None:
+            await _send_error(send, 404)
+            return
+        if file.variants:
+            file = file.select(_get_header(scope, b"accept-encoding"))
+
+        content = None
+        if self.cache_size and method == "GET":
+            content = await self._get_cached(file)
+
+        await send_file(
+            file, scope, send, content=content, chunk_size=self.chunk_size
+        )
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _parse_http_date(value: bytes) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value.decode("latin-1")).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _get_validators(
+    headers: RawHeaders,
+) -> Tuple[Optional[str], Optional[float]]:
+    # Validators are read from the final response headers, which may have
+    # been overridden, e.g. by `res.headers["etag"]`.
+    etag = last_modified = None
+    for name, value in headers:
+        if name == b"etag":
+            etag = value.decode("latin-1")
+        elif name == b"last-modified":
+            last_modified = _parse_http_date(value)
+    return etag, last_modified
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _is_not_modified(
+    headers: Dict[bytes, bytes],
+    etag: Optional[str],
+    last_modified: Optional[float],
+) -> bool:
+    # Evaluate `If-None-Match` or, if absent, `If-Modified-Since`.
+    if_none_match = headers.get(b"if-none-match")
+    if if_none_match is not None:
+        etags = [
+            candidate.strip()
+            for candidate in if_none_match.decode("latin-1").split(",")
+        ]
+        if "*" in etags:
+            return True
+        # NOTE: weak comparison, i.e. `W/` prefixes are ignored.
+        return etag is not None and any(
+            _strip_weak(candidate) == _strip_weak(etag) for candidate in etags
+        )
+
+    if_modified_since = headers.get(b"if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        timestamp = _parse_http_date(if_modified_since)
+        # NOTE: HTTP dates have a resolution of one second.
+        return timestamp is not None and int(last_modified) <= timestamp
+
+    return False
+
+
+def _if_range_matches(
+    if_range: Optional[bytes],
+    etag: Optional[str],
+    last_modified: Optional[float],
+) -> bool:
+    if if_range is None:
+        return True
+    value = if_range.decode("latin-1").strip()
+    if value.startswith(('"', "W/")):
+        # Strong comparison: weak entity tags never match.
+        return etag is not None and not etag.startswith("W/") and value == etag
+    if last_modified is None:
+        return False
+    return _parse_http_date(if_range) == int(last_modified)
+
+
+def parse_range(value: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parse a `Range` header.
+
+    # Parameters
+    value (str): the value of a `Range` header, e.g. `"bytes=0-99"`.
+    size (int): the size of the requested file, in bytes.
 
     # Returns
-    app (WSGIApp): a WSGI-compliant application.
+    ranges (list of tuples):
+        satisfiable ranges, as `(start, end)` tuples where `end` is
+        inclusive. The list is empty if no range is satisfiable.
+        `None` is returned if the header is invalid, or if it contains
+        more than `MAX_RANGES` ranges, in which case it should be ignored.
+    """
+    unit, _, specs = value.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+    specs = specs.split(",")
+    if len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for spec in specs:
+        # NOTE: `int()` would also accept signs, underscores and whitespace,
+        # and `str.isdigit()` accepts non-ASCII digits such as `"²"`.
+        match = _RANGE_SPEC.match(spec.strip())
+        if match is None:
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            # Suffix range, i.e. the last N bytes.
+            suffix = int(last)
+            if suffix > 0 and size > 0:
+                ranges.append((max(0, size - suffix), size - 1))
+            continue
+        start = int(first)
+        end = int(last) if last else None
+        if end is not None and end < start:
+            return None
+        if start < size:
+            end = size - 1 if end is None else min(end, size - 1)
+            ranges.append((start, end))
+    return ranges
+
+
+async def send_file(
+    file: StaticFile,
+    scope: Scope,
+    send: Send,
+    status_code: int = 200,
+    headers: Optional[RawHeaders] = None,
+    content: Optional[bytes] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """Send a file as the response to an HTTP request.
+
+    Conditional requests (`If-None-Match` and `If-Modified-Since`) result
+    in `304 Not Modified` responses, and range requests (`Range` and
+    `If-Range`) result in `206 Partial Content` responses, including
+    `multipart/byteranges` responses for multiple ranges. These headers
+    are only taken into account if `status_code` is 200.
+
+    # Parameters
+    file (StaticFile): the file to send.
+    scope (dict): the ASGI scope of the request.
+    send (callable): the ASGI `send` callable.
+    status_code (int): the status code of the (full) response.
+    headers (list of tuples):
+        extra raw headers, which take precedence over those of the file,
+        including the `ETag` and `Last-Modified` validators used to evaluate
+        conditional requests.
+    content (bytes):
+        the contents of the file, if already in memory. Otherwise, the file
+        is sent using the `http.response.zerocopysend` ASGI extension if
+        the server supports it, or read in chunks of `chunk_size` bytes.
+    chunk_size (int): the size of chunks the file is read in, in bytes.
+    """
+    method = scope["method"]
+    request_headers = dict(scope["headers"])
+    response_headers = file.headers
+    if headers:
+        names = {name for name, _ in headers}
+        response_headers = [
+            header for header in file.headers if header[0] not in names
+        ] + headers
+
+    conditional = status_code == 200 and method in ("GET", "HEAD")
+    if conditional:
+        etag, last_modified = _get_validators(response_headers)
+    if conditional and _is_not_modified(request_headers, etag, last_modified):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [
+                    header
+                    for header in response_headers
+                    if header[0] in _NOT_MODIFIED_HEADERS
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    size = file.size
+    # Parts of the body: literal bytes, or `(offset, count)` file regions.
+    parts: List[Union[bytes, Tuple[int, int]]] = [(0, size)]
+    range_header = request_headers.get(b"range")
+    if (
+        conditional
+        and method == "GET"
+        and range_header is not None
+        and _if_range_matches(
+            request_headers.get(b"if-range"), etag, last_modified
+        )
+    ):
+        ranges = parse_range(range_header.decode("latin-1"), size)
+        if ranges is not None:
+            status_code, response_headers, parts = _get_partial_response(
+                file, response_headers, ranges
+            )
+
+    if method == "HEAD":
+        parts = []
+    if parts and content is None:
+        try:
+            f = await run_in_threadpool(open, file.path, "rb")
+        except OSError:
+            await _send_error(send, 404)
+            return
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": response_headers,
+        }
+    )
+    if not parts:
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    if content is not None:
+        view = memoryview(content)
+        for index, part in enumerate(parts):
+            more_body = index < len(parts) - 1
+            if not isinstance(part, bytes):
+                offset, count = part
+                part = (
+                    content
+                    if count == len(content)
+                    else view[offset : offset + count]
+                )
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": part,
+                    "more_body": more_body,
+                }
+            )
+        return
+
+    zero_copy = ZERO_COPY_SEND in scope.get("extensions", {})
+    with f:
+        for index, part in enumerate(parts):
+            more_body = index < len(parts) - 1
+            if isinstance(part, bytes):
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": part,
+                        "more_body": more_body,
+                    }
+                )
+                continue
+            offset, count = part
+            if zero_copy:
+                await send(
+                    {
+                        "type": ZERO_COPY_SEND,
+                        "file": f,
+                        "offset": offset,
+                        "count": count,
+                        "more_body": more_body,
+                    }
+                )
+            else:
+                await _send_chunks(
+                    send, f, offset, count, chunk_size, more_body
+                )
+
+
+def _get_partial_response(
+    file: StaticFile, headers: RawHeaders, ranges: List[Tuple[int, int]]
+) -> Tuple[int, RawHeaders, list]:
+    # Return the status code, headers and body parts of the response
+    # to a range request.
+    size = file.size
+    if not ranges:
+        headers = [header for header in headers if header[0] != CONTENT_LENGTH]
+        headers += [
+            (CONTENT_RANGE, f"bytes */{size}".encode()),
+            (CONTENT_LENGTH, b"0"),
+        ]
+        return 416, headers, []
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers = [header for header in headers if header[0] != CONTENT_LENGTH]
+        headers += [
+            (CONTENT_RANGE, f"bytes {start}-{end}/{size}".encode()),
+            (CONTENT_LENGTH, str(end - start + 1).encode()),
+        ]
+        return 206, headers, [(start, end - start + 1)]
 
-    # See Also
-    - [WhiteNoise](http://whitenoise.evans.io)
-    - [WSGI](https://wsgi.readthedocs.io)
+    content_type = dict(headers).get(CONTENT_TYPE, b"application/octet-stream")
+    boundary = os.urandom(12).hex().encode()
+    parts: list = []
+    length = 0
+    for index, (start, end) in enumerate(ranges):
+        part_headers = (
+            (b"\r\n" if index else b"")
+            + b"--"
+            + boundary
+            + b"\r\ncontent-type: "
+            + content_type
+            + f"\r\ncontent-range: bytes {start}-{end}/{size}\r\n\r\n".encode()
+        )
+        parts += [part_headers, (start, end - start + 1)]
+        length += len(part_headers) + end - start + 1
+    closing = b"\r\n--" + boundary + b"--\r\n"
+    parts.append(closing)
+    length += len(closing)
+
+    headers = [
+        header
+        for header in headers
+        if header[0] not in (CONTENT_LENGTH, CONTENT_TYPE)
+    ]
+    headers += [
+        (CONTENT_TYPE, b"multipart/byteranges; boundary=" + boundary),
+        (CONTENT_LENGTH, str(length).encode()),
+    ]
+    return 206, headers, parts
+
+
+def _read_at(f: BinaryIO, offset: int, count: int) -> bytes:
+    f.seek(offset)
+    return f.read(count)
+
+
+async def _send_chunks(
+    send: Send,
+    f: BinaryIO,
+    offset: int,
+    count: int,
+    chunk_size: int,
+    more_body: bool,
+):
+    remaining = count
+    while remaining > 0:
+        # NOTE: even small reads may block on disk I/O, so they are never
+        # performed on the event loop.
+        chunk = await run_in_threadpool(
+            _read_at, f, offset, min(chunk_size, remaining)
+        )
+        if not chunk:
+            # The file was truncated since it was indexed.
+            break
+        offset += len(chunk)
+        remaining -= len(chunk)
+        await send(
+            {
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": more_body or remaining > 0,
+            }
+        )
+    if remaining > 0 and not more_body:
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def _send_error(
+    send: Send, status_code: int, headers: Optional[RawHeaders] = None
+):
+    body = HTTPStatus(status_code).phrase.encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"text/plain"),
+                (b"content-length", str(len(body)).encode()),
+                *(headers or []),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def _gzip_compress(data: bytes) -> bytes:
+    # `gzip.compress()` only accepts `mtime` on Python 3.8+.
+    buffer = BytesIO()
+    with gzip.GzipFile(
+        fileobj=buffer, mode="wb", compresslevel=9, mtime=0
+    ) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def compress(
+    directory: str, min_size: int = 512, min_ratio: float = 0.95
+) -> List[str]:
+    """Generate precompressed variants of files under a directory.
+
+    A `.gz` file is generated for each file, as well as a `.br` file if
+    `brotli` is installed. Files which are already compressed (e.g. images),
+    smaller than `min_size` or which do not compress well are skipped.
+
+    # Parameters
+    directory (str): the path to a directory, e.g. of static files.
+    min_size (int): the minimum size of files to compress, in bytes.
+    min_ratio (float):
+        variants are only kept if their size is less than this ratio
+        of the size of the original file.
+
+    # Returns
+    paths (list of str): the paths of the generated files.
+    """
+    compressors = [(".gz", _gzip_compress)]
+    if brotli is not None:
+        compressors.append((".br", brotli.compress))
+
+    generated = []
+    for root, _, filenames in os.walk(directory, followlinks=True):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            _, extension = os.path.splitext(filename)
+            if extension.lower() in COMPRESSED_EXTENSIONS:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+            for compressed_extension, compressor in compressors:
+                compressed = compressor(data)
+                if len(compressed) >= len(data) * min_ratio:
+                    continue
+                with open(path + compressed_extension, "wb") as f:
+                    f.write(compressed)
+                generated.append(path + compressed_extension)
+    return generated
+
+
+def static(directory: str, **kwargs) -> StaticFiles:
+    """Return an ASGI app that serves static files under the given directory.
+
+    # Parameters
+    directory (str):
+        the path to a directory from where static files should be served.
+        If the directory does not exist, no files will be served.
+    **kwargs (any):
+        passed to [StaticFiles](#staticfiles).
+
+    # Returns
+    app (StaticFiles): an ASGI application.
     """
-    app = WhiteNoise(empty_wsgi_app())
-    if exists(directory):
-        app.add_files(directory)
-    return app
+    return StaticFiles(directory, **kwargs)
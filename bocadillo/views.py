@@ -1,10 +1,19 @@
 import inspect
-from functools import partial, wraps
-from typing import List, Union, Any, Dict
+from functools import partial
+from types import MappingProxyType
+from typing import List, Union, Any, Dict, FrozenSet, Mapping, Optional
+
+from starlette.concurrency import run_in_threadpool
 
 from .app_types import Handler
-from .compat import call_async, camel_to_snake
+from .compat import camel_to_snake
 from .constants import ALL_HTTP_METHODS
+from .executors import (
+    PROCESS,
+    call_compute,
+    get_compute_key,
+    register_compute,
+)
 
 MethodsParam = Union[List[str], all]
 
@@ -42,10 +51,33 @@ class View:
     # Attributes
 
     name (str): the name of the view.
+    allowed_methods (frozenset of str):
+        the (upper-cased) HTTP methods supported by the view.
+    executor (str):
+        the name of the pool synchronous handlers and hooks are run in.
+        `None` refers to the default pool. If `"process"`, handlers are
+        run in the process pool (see [from_handler](#from-handler))
+        while hooks are run in the default pool.
+    pool (ThreadPool):
+        the pool synchronous handlers and hooks are run in. This is set
+        when the view is registered on a router. If `None`, they are run
+        in the event loop's default thread pool.
+    process_pool (ProcessPool):
+        the pool handlers are run in if `executor` is `"process"`.
+        This is set when the view is registered on a router. If `None`,
+        handlers are run in the event loop's default thread pool.
     """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, executor: Optional[str] = None):
         self.name = name
+        self.executor = executor
+        self.pool = None
+        self.process_pool = None
+        self.allowed_methods: FrozenSet[str] = frozenset()
+        # Mapping of HTTP methods to handlers, used for dispatching.
+        self._handlers: Mapping[str, Handler] = MappingProxyType({})
+        # Handler for methods which are not in `_handlers`, i.e. `.handle()`.
+        self._fallback: Optional[Handler] = None
 
     get: Handler
     post: Handler
@@ -56,16 +88,34 @@ class View:
     options: Handler
 
     @classmethod
-    def create(cls, name: str, docstring: str, handlers: dict) -> "View":
+    def create(
+        cls,
+        name: str,
+        docstring: str,
+        handlers: dict,
+        executor: Optional[str] = None,
+    ) -> "View":
         # Create a view object.
-        view = cls(name)
+        view = cls(name, executor=executor)
         view.__doc__ = docstring
 
-        # Convert handlers to async if necessary
+        from .hooks import compile_handler  # prevent circular imports
+
+        run_handler = None
+        if executor == PROCESS:
+            run_handler = view._run_in_process
+            for handler in handlers.values():
+                func = inspect.unwrap(handler)
+                assert not inspect.iscoroutinefunction(
+                    func
+                ), "Handlers run in the process pool must be synchronous."
+                register_compute(func)
+
+        # Convert handlers to async (along with their hooks) if necessary
         for method, handler in handlers.items():
-            if not inspect.iscoroutinefunction(handler):
-                handler = wraps(handler)(partial(call_async, handler))
-                handlers[method] = handler
+            handlers[method] = compile_handler(
+                handler, run_sync=view._run_sync, run_handler=run_handler
+            )
 
         # Set head handler if not given but get is given.
         if "get" in handlers and "head" not in handlers:
@@ -74,23 +124,49 @@ class View:
         for method, handler in handlers.items():
             setattr(view, method, handler)
 
+        # Build the dispatch table.
+        if "handle" in handlers:
+            view._fallback = handlers["handle"]
+            view.allowed_methods = frozenset(ALL_HTTP_METHODS)
+        else:
+            view._handlers = MappingProxyType(
+                {
+                    method.upper(): handler
+                    for method, handler in handlers.items()
+                }
+            )
+            view.allowed_methods = frozenset(view._handlers)
+
         return view
 
-    def _get_handler(self, req):
-        if hasattr(self, "handle"):
-            return self.handle
-        return getattr(self, req.method.lower())
+    async def _run_sync(self, func, *args, **kwargs):
+        # Run a synchronous handler or hook.
+        if self.pool is None:
+            return await run_in_threadpool(func, *args, **kwargs)
+        return await self.pool.run(func, *args, **kwargs)
+
+    async def _run_in_process(self, func, req, res, **kwargs):
+        # Run a handler in the process pool. Only route parameters
+        # are sent to the worker process, and the result becomes the
+        # response's media.
+        # NOTE: functions are looked up by key because their names refer
+        # to the view, which means they cannot be pickled.
+        args = (get_compute_key(func), kwargs)
+        if self.process_pool is None:
+            res.media = await run_in_threadpool(call_compute, *args)
+        else:
+            res.media = await self.process_pool.run(call_compute, *args)
 
     async def __call__(self, req, res, **kwargs):
-        try:
-            handler: Handler = self._get_handler(req)
-        except AttributeError as e:
-            raise HandlerDoesNotExist from e
-        else:
-            await handler(req, res, **kwargs)
+        handler = self._handlers.get(req.method, self._fallback)
+        if handler is None:
+            raise HandlerDoesNotExist
+        await handler(req, res, **kwargs)
 
 
-def from_handler(handler: Handler, methods: MethodsParam = None) -> View:
+def from_handler(
+    handler: Handler, methods: MethodsParam = None, executor: str = None
+) -> View:
     """Convert a handler to a `View` instance.
 
     # Parameters
@@ -102,12 +178,21 @@ def from_handler(handler: Handler, methods: MethodsParam = None) -> View:
     methods (list of str):
         A list of supported HTTP methods. The `all` built-in can be used
         to support all HTTP methods. Defaults to `["get"]`.
+    executor (str):
+        The name of the pool the handler is run in if it is synchronous.
+        Defaults to `None`, i.e. the default pool.
+        If `"process"`, the handler is run in a worker process, which is
+        useful for CPU-bound work. In that case, the handler must be a
+        synchronous module-level function. It is only given the route
+        parameters, e.g. `compute(**params)`, and the value it returns
+        is used as the response's media.
 
     # Returns
     view (View): a `View` instance.
 
     # See Also
     - The [constants](./constants.md) module for the list of all HTTP methods.
+    - [Executors](./executors.md#executors) for configuring pools.
     """
     if methods is None:
         methods = ["get"]
@@ -116,7 +201,9 @@ def from_handler(handler: Handler, methods: MethodsParam = None) -> View:
     else:
         methods = [m.lower() for m in methods]
     handlers = {method: handler for method in methods}
-    return View.create(handler.__name__, handler.__doc__, handlers)
+    return View.create(
+        handler.__name__, handler.__doc__, handlers, executor=executor
+    )
 
 
 def from_obj(obj: Any) -> View:
@@ -152,9 +239,9 @@ def get_handlers(obj: Any) -> Dict[str, Handler]:
     }
 
 
-def view(methods: MethodsParam = None):
+def view(methods: MethodsParam = None, executor: str = None):
     """Convert the decorated function to a proper `View` object.
 
     This decorator is a shortcut for [from_handler](#from-handler).
     """
-    return partial(from_handler, methods=methods)
+    return partial(from_handler, methods=methods, executor=executor)
@@ -1,4 +1,3 @@
-import json
 from typing import Awaitable, Callable, Optional, Any, Union, Tuple
 
 from starlette.datastructures import URL
@@ -9,6 +8,7 @@ from starlette.websockets import (
 
 from .app_types import Event
 from .constants import WEBSOCKET_CLOSE_CODES
+from .json_engines import STDLIB, JSONEngine
 
 _STARLETTE_WEBSOCKET_DOCS = (
     "[Starlette.websockets.WebSocket](https://www.starlette.io/websockets/)"
@@ -65,6 +65,9 @@ class WebSocket:
     caught_close_codes (tuple of int):
         Close codes of `WebSocketDisconnect` exceptions that should be
         caught and silenced. Defaults to `(1000, 1001)`.
+    json_engine (JSONEngine):
+        Used to encode and decode JSON messages.
+        Defaults to the standard library's `json` module.
     args (any):
         Passed to the underlying Starlette `WebSocket` object. This is
         typically the ASGI `scope`, `receive` and `send` objects.
@@ -80,6 +83,7 @@ class WebSocket:
         receive_type: Optional[str] = None,
         send_type: Optional[str] = None,
         caught_close_codes: Optional[Tuple[int]] = None,
+        json_engine: JSONEngine = STDLIB,
     ):
         # NOTE: we use composition over inheritance here, because
         # we want to redefine `receive()` and `send()` but Starlette's
@@ -101,6 +105,7 @@ class WebSocket:
             send_type = send_type or self.__default_send_type__
         self.receive_type = receive_type
         self.send_type = send_type
+        self._json_engine = json_engine
 
     # Methods delegated to the underlying Starlette WebSocket object.
     # TODO: add type annotations.
@@ -116,24 +121,27 @@ class WebSocket:
         return self._websocket.url
 
     async def receive_json(self) -> Union[dict, list]:
-        """Return `json.loads(await self.receive_text())`.
+        """Return `json_engine.loads(await self.receive_text())`.
 
         # Returns
         json (dict or list): a JSON message.
         """
         # Starlette decodes from bytes by default,
         # but most WebSocket clients generally send text.
-        return json.loads(await self.receive_text())
+        return self._json_engine.loads(await self.receive_text())
 
     async def send_json(self, message: Union[dict, list]):
-        """Execute `await self.send_text(json.dumps(message))`.
+        """Execute `await self.send_text(json_engine.dumps(message))`.
 
         # Parameters
         message (list or dict): a JSON message.
         """
         # Encodes as bytes by default,
         # but most WebSocket clients don't expect to receive plain bytes.
-        await self.send_text(json.dumps(message))
+        text = self._json_engine.dumps(message)
+        if isinstance(text, bytes):
+            text = text.decode("utf-8")
+        await self.send_text(text)
 
     async def receive_event(self) -> Event:
         return await self._websocket.receive()
@@ -25,7 +25,6 @@ setuptools.setup(
         "starlette",
         "uvicorn",
         "jinja2",
-        "whitenoise",
         "requests",
         "parse",
         "websockets>=6.0",
@@ -18,3 +18,19 @@ def test_get_version(runner, flag):
     result = runner.invoke(cli, [flag])
     assert result.exit_code == 0
     assert __version__ in result.output
+
+
+def test_compress_static(runner, tmpdir):
+    tmpdir.join("app.js").write("console.log('foo');\n" * 100)
+    cli = create_cli()
+
+    result = runner.invoke(cli, ["compress:static", str(tmpdir)])
+    assert result.exit_code == 0
+    assert "Compressed" in result.output
+    assert tmpdir.join("app.js.gz").exists()
+
+
+def test_compress_static_directory_must_exist(runner, tmpdir):
+    cli = create_cli()
+    result = runner.invoke(cli, ["compress:static", str(tmpdir.join("foo"))])
+    assert result.exit_code != 0
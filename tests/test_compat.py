@@ -0,0 +1,57 @@
+from functools import partial
+
+import pytest
+
+from bocadillo.compat import is_async_callable, to_async
+
+
+async def coroutine_function():
+    return "async"
+
+
+def function():
+    return "sync"
+
+
+class AsyncCallable:
+    async def __call__(self):
+        return "async"
+
+    async def method(self):
+        return "async"
+
+
+class SyncCallable:
+    def __call__(self):
+        return "sync"
+
+
+@pytest.mark.parametrize(
+    "func, expected",
+    [
+        (coroutine_function, True),
+        (function, False),
+        (partial(coroutine_function), True),
+        (partial(function), False),
+        (AsyncCallable(), True),
+        (AsyncCallable().method, True),
+        (SyncCallable(), False),
+        (print, False),
+    ],
+)
+def test_is_async_callable(func, expected: bool):
+    assert is_async_callable(func) is expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "func, expected",
+    [
+        (coroutine_function, "async"),
+        (function, "sync"),
+        (AsyncCallable(), "async"),
+        (SyncCallable(), "sync"),
+    ],
+)
+async def test_to_async(func, expected: str):
+    assert await to_async(func)() == expected
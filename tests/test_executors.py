@@ -0,0 +1,231 @@
+import asyncio
+import inspect
+import os
+import threading
+
+import pytest
+
+from bocadillo import API, HTTPError, view, hooks
+from bocadillo.executors import (
+    _COMPUTE_FUNCTIONS,
+    Executors,
+    ProcessPool,
+    ThreadPool,
+    get_compute_key,
+)
+
+
+def test_sync_views_run_in_dedicated_pool(api: API):
+    @api.route("/")
+    def index(req, res):
+        res.text = threading.current_thread().name
+
+    assert api.client.get("/").text.startswith("bocadillo-default")
+
+
+def test_view_can_use_named_pool():
+    api = API(executors={"reports": {"max_workers": 2}})
+
+    @api.route("/")
+    @view(executor="reports")
+    def index(req, res):
+        res.text = threading.current_thread().name
+
+    assert api.client.get("/").text.startswith("bocadillo-reports")
+    metrics = api.executors.metrics()
+    assert metrics["reports"]["max_workers"] == 2
+    assert metrics["reports"]["calls"] == 1
+
+
+def test_sync_hooks_run_in_view_pool(api: API):
+    threads = []
+
+    def before(req, res, params):
+        threads.append(threading.current_thread().name)
+
+    @api.route("/")
+    @view(executor="hooks")
+    @hooks.before(before)
+    async def index(req, res):
+        pass
+
+    api.client.get("/")
+    assert threads[0].startswith("bocadillo-hooks")
+
+
+def test_unconfigured_pools_use_default_settings():
+    executors = Executors({"default": {"max_workers": 3}})
+    assert executors.get("foo").max_workers == 3
+
+
+def test_max_workers_does_not_create_executor():
+    pool = ThreadPool()
+    assert pool.max_workers > 0
+    assert ThreadPool(max_workers=3).max_workers == 3
+    assert pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_shutdown_does_not_block_event_loop():
+    executors = Executors()
+    pool = executors.get()
+    event = threading.Event()
+    running = asyncio.ensure_future(pool.run(event.wait))
+    await asyncio.sleep(0.01)
+
+    shutdown = asyncio.ensure_future(executors.shutdown())
+    await asyncio.sleep(0.01)
+    # The loop is still running while the shutdown waits for the call.
+    assert not shutdown.done()
+    event.set()
+    await shutdown
+    await running
+    assert pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_metrics():
+    pool = ThreadPool(max_workers=1)
+
+    def add(x, y):
+        return x + y
+
+    assert await pool.run(add, 1, y=2) == 3
+
+    metrics = pool.metrics()
+    assert metrics["calls"] == 1
+    assert metrics["in_flight"] == 0
+    assert metrics["wait_time"] >= 0
+    assert metrics["run_time"] >= 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_if_queue_is_full_then_503():
+    pool = ThreadPool(max_workers=1, max_queue=0)
+    event = threading.Event()
+
+    blocked = asyncio.ensure_future(pool.run(event.wait))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(HTTPError) as ctx:
+        await pool.run(print)
+    assert ctx.value.status_code == 503
+    assert pool.rejected == 1
+
+    event.set()
+    await blocked
+    pool.shutdown()
+
+
+def test_pools_are_shut_down_on_shutdown(api: API):
+    @api.route("/")
+    def index(req, res):
+        pass
+
+    with api.client:
+        api.client.get("/")
+        assert api.executors.get()._executor is not None
+    assert api.executors.get()._executor is None
+
+
+def fib(n: int) -> int:
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+# NOTE: views run in the process pool must be defined at the module level
+# so that worker processes can import them.
+
+
+@view(executor="process")
+def compute(n: int):
+    return {"result": fib(n), "pid": os.getpid()}
+
+
+hook_pids = []
+
+
+def record_pid(req, res, params):
+    hook_pids.append(os.getpid())
+    res.headers["x-n"] = str(params["n"])
+
+
+@view(executor="process")
+@hooks.after(record_pid)
+def compute_with_hook(n: int):
+    return fib(n)
+
+
+def test_process_view_runs_in_worker_process():
+    api = API(executors={"process": {"max_workers": 1}})
+    api.route("/fib/{n:d}")(compute)
+
+    with api.client:
+        assert api.executors.get("process")._executor is not None
+        response = api.client.get("/fib/10")
+        assert response.status_code == 200
+        json = response.json()
+        assert json["result"] == 55
+        assert json["pid"] != os.getpid()
+        assert api.executors.metrics()["process"]["calls"] == 1
+
+    assert api.executors.get("process")._executor is None
+
+
+def test_process_view_hooks_run_in_main_process(api: API):
+    api.route("/fib/{n:d}")(compute_with_hook)
+    hook_pids.clear()
+
+    with api.client:
+        response = api.client.get("/fib/5")
+
+    assert response.json() == 5
+    assert response.headers["x-n"] == "5"
+    assert hook_pids == [os.getpid()]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_spawns_workers_on_startup():
+    pool = ProcessPool(max_workers=2)
+    await pool.startup()
+    try:
+        assert len(pool._executor._processes) == 2
+    finally:
+        pool.shutdown()
+
+
+def test_process_view_must_be_sync():
+    with pytest.raises(AssertionError):
+
+        @view(executor="process")
+        async def compute():
+            pass
+
+
+@pytest.fixture
+def local_compute():
+    @view(executor="process")
+    def compute(n):
+        return n * 2
+
+    key = get_compute_key(inspect.unwrap(compute.get))
+    yield compute
+    _COMPUTE_FUNCTIONS.pop(key)
+
+
+def test_local_process_view_runs_in_forked_worker(local_compute):
+    api = API(executors={"process": {"max_workers": 1}})
+    api.executors.get("process").start_method = "fork"
+    api.route("/double/{n:d}")(local_compute)
+
+    with api.client:
+        assert api.client.get("/double/2").json() == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver"])
+async def test_local_process_view_needs_fork(local_compute, start_method):
+    pool = ProcessPool(max_workers=1, start_method=start_method)
+    with pytest.raises(ValueError) as ctx:
+        await pool.startup()
+    assert "module level" in str(ctx.value)
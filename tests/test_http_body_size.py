@@ -0,0 +1,90 @@
+import pytest
+
+from bocadillo import API, HTTPError, view
+from bocadillo.request import Request
+
+
+def chunks(n: int, size: int = 10):
+    for _ in range(n):
+        yield b"x" * size
+
+
+@pytest.fixture
+def limited_api():
+    api = API(max_body_size=100)
+    received = []
+
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        received.append(True)
+        res.text = str(len(await req.body()))
+
+    @api.route("/uploads", max_body_size=1000)
+    @view(methods=["post"])
+    async def upload(req, res):
+        res.text = str(len(await req.body()))
+
+    @api.route("/small", max_body_size=10)
+    @view(methods=["post"])
+    async def small(req, res):
+        res.text = str(len(await req.body()))
+
+    api.received = received
+    return api
+
+
+def test_no_limit_by_default(api: API):
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        res.text = str(len(await req.body()))
+
+    assert api.client.post("/", data=b"x" * 10000).text == "10000"
+
+
+def test_body_within_limit(limited_api: API):
+    response = limited_api.client.post("/", data=b"x" * 100)
+    assert response.status_code == 200
+    assert response.text == "100"
+
+
+def test_content_length_too_large_is_rejected_before_view(limited_api: API):
+    response = limited_api.client.post("/", data=b"x" * 101)
+    assert response.status_code == 413
+    assert limited_api.received == []
+
+
+def test_streamed_body_too_large(limited_api: API):
+    # No Content-Length: bytes are counted as they are received.
+    response = limited_api.client.post("/", data=chunks(20))
+    assert response.status_code == 413
+
+
+def test_streamed_body_within_limit(limited_api: API):
+    response = limited_api.client.post("/", data=chunks(5))
+    assert response.status_code == 200
+    assert response.text == "50"
+
+
+@pytest.mark.parametrize(
+    "path, size, status", [("/uploads", 500, 200), ("/small", 50, 413)]
+)
+def test_route_overrides_limit(limited_api: API, path, size, status):
+    response = limited_api.client.post(path, data=b"x" * size)
+    assert response.status_code == status
+    response = limited_api.client.post(path, data=chunks(size // 10))
+    assert response.status_code == status
+
+
+def test_invalid_content_length():
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-length", b"foo")],
+    }
+    req = Request(scope)
+    with pytest.raises(HTTPError) as ctx:
+        req.limit_body_size(100)
+    assert ctx.value.status_code == 400
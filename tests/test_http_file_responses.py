@@ -0,0 +1,287 @@
+import pytest
+
+from bocadillo import API
+from bocadillo.staticfiles import parse_range, static
+
+CONTENT = b"0123456789" * 10
+
+
+@pytest.fixture
+def path(tmpdir) -> str:
+    f = tmpdir.join("data.txt")
+    f.write_binary(CONTENT)
+    return str(f)
+
+
+@pytest.fixture
+def file_api(api: API, path: str) -> API:
+    @api.route("/file")
+    async def send(req, res):
+        res.file(path)
+
+    return api
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("bytes=0-9", [(0, 9)]),
+        ("bytes=90-", [(90, 99)]),
+        ("bytes=-5", [(95, 99)]),
+        ("bytes=-500", [(0, 99)]),
+        ("bytes=95-200", [(95, 99)]),
+        ("bytes=0-0, 5-9", [(0, 0), (5, 9)]),
+        ("bytes=100-", []),
+        ("bytes=-0", []),
+        ("bytes=5-2", None),
+        ("bytes=a-b", None),
+        ("bytes=5", None),
+        ("bytes=-", None),
+        ("bytes=--5", None),
+        ("bytes=+1-2", None),
+        ("bytes=1-+2", None),
+        ("bytes=1_0-20", None),
+        ("bytes=\xb2-5", None),
+        ("items=0-9", None),
+        ("bytes=" + ",".join(["0-1"] * 17), None),
+    ],
+)
+def test_parse_range(value, expected):
+    assert parse_range(value, 100) == expected
+
+
+def test_send_file(file_api: API):
+    response = file_api.client.get("/file")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-type"] == "text/plain; charset=utf-8"
+    assert response.headers["content-length"] == "100"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"]
+    assert response.headers["last-modified"]
+    assert "cache-control" not in response.headers
+
+
+def test_response_headers_take_precedence(api: API, path: str):
+    @api.route("/file")
+    async def send(req, res):
+        res.file(path)
+        res.headers["content-type"] = "application/octet-stream"
+        res.headers["content-disposition"] = "attachment"
+
+    response = api.client.get("/file")
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["content-disposition"] == "attachment"
+
+
+def test_missing_file_raises(api: API, tmpdir):
+    @api.route("/file")
+    async def send(req, res):
+        res.file(str(tmpdir.join("missing.txt")))
+
+    with pytest.raises(FileNotFoundError):
+        api.client.get("/file")
+
+
+def test_if_none_match(file_api: API):
+    etag = file_api.client.get("/file").headers["etag"]
+
+    for value in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = file_api.client.get(
+            "/file", headers={"if-none-match": value}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert "content-length" not in response.headers
+
+    response = file_api.client.get("/file", headers={"if-none-match": '"a"'})
+    assert response.status_code == 200
+
+
+def test_if_modified_since(file_api: API):
+    last_modified = file_api.client.get("/file").headers["last-modified"]
+
+    response = file_api.client.get(
+        "/file", headers={"if-modified-since": last_modified}
+    )
+    assert response.status_code == 304
+
+    response = file_api.client.get(
+        "/file", headers={"if-modified-since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+
+    response = file_api.client.get(
+        "/file", headers={"if-modified-since": "not a date"}
+    )
+    assert response.status_code == 200
+
+
+def test_if_none_match_takes_precedence(file_api: API):
+    last_modified = file_api.client.get("/file").headers["last-modified"]
+    response = file_api.client.get(
+        "/file",
+        headers={"if-none-match": '"a"', "if-modified-since": last_modified},
+    )
+    assert response.status_code == 200
+
+
+def test_conditional_headers_ignored_if_not_200(api: API, path: str):
+    @api.route("/file")
+    async def send(req, res):
+        res.file(path)
+        res.status_code = 201
+
+    etag = api.client.get("/file").headers["etag"]
+    response = api.client.get(
+        "/file", headers={"if-none-match": etag, "range": "bytes=0-1"}
+    )
+    assert response.status_code == 201
+    assert response.content == CONTENT
+
+
+def test_single_range(file_api: API):
+    response = file_api.client.get("/file", headers={"range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/100"
+    assert response.headers["content-length"] == "10"
+    assert response.headers["content-type"] == "text/plain; charset=utf-8"
+
+
+def test_unsatisfiable_range(file_api: API):
+    response = file_api.client.get("/file", headers={"range": "bytes=200-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */100"
+    assert response.content == b""
+
+
+def test_invalid_range_is_ignored(file_api: API):
+    response = file_api.client.get("/file", headers={"range": "bytes=9-1"})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_multiple_ranges(file_api: API):
+    response = file_api.client.get("/file", headers={"range": "bytes=0-4, 95-"})
+    assert response.status_code == 206
+    content_type = response.headers["content-type"]
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    boundary = content_type.split("=")[1]
+    assert response.headers["content-length"] == str(len(response.content))
+    assert (
+        response.content
+        == (
+            f"--{boundary}\r\n"
+            "content-type: text/plain; charset=utf-8\r\n"
+            "content-range: bytes 0-4/100\r\n\r\n"
+            "01234\r\n"
+            f"--{boundary}\r\n"
+            "content-type: text/plain; charset=utf-8\r\n"
+            "content-range: bytes 95-99/100\r\n\r\n"
+            "56789\r\n"
+            f"--{boundary}--\r\n"
+        ).encode()
+    )
+
+
+def test_if_range(file_api: API):
+    response = file_api.client.get("/file")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    for if_range in (etag, last_modified):
+        response = file_api.client.get(
+            "/file", headers={"range": "bytes=0-4", "if-range": if_range}
+        )
+        assert response.status_code == 206
+
+    for if_range in ('"other"', f"W/{etag}", "Thu, 01 Jan 1970 00:00:00 GMT"):
+        response = file_api.client.get(
+            "/file", headers={"range": "bytes=0-4", "if-range": if_range}
+        )
+        assert response.status_code == 200
+        assert response.content == CONTENT
+
+
+def test_overridden_validators_are_used(api: API, path: str):
+    @api.route("/file")
+    async def send(req, res):
+        res.file(path)
+        res.headers["etag"] = '"v1"'
+        res.headers["last-modified"] = "Thu, 01 Jan 1970 00:00:00 GMT"
+
+    for headers in (
+        {"if-none-match": '"v1"'},
+        {"if-modified-since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    ):
+        response = api.client.get("/file", headers=headers)
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"v1"'
+
+    for if_range in ('"v1"', "Thu, 01 Jan 1970 00:00:00 GMT"):
+        response = api.client.get(
+            "/file", headers={"range": "bytes=0-4", "if-range": if_range}
+        )
+        assert response.status_code == 206
+
+    response = api.client.get(
+        "/file", headers={"range": "bytes=0-4", "if-range": '"other"'}
+    )
+    assert response.status_code == 200
+
+
+def test_range_is_ignored_for_head_requests(file_api: API):
+    response = file_api.client.head("/file", headers={"range": "bytes=0-4"})
+    assert response.status_code == 200
+    assert response.headers["content-length"] == "100"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_size", [0, 1024])
+@pytest.mark.parametrize("zero_copy", [False, True])
+async def test_static_files_support_ranges(tmpdir, cache_size, zero_copy):
+    tmpdir.join("data.txt").write_binary(CONTENT)
+    app = static(str(tmpdir), cache_size=cache_size, chunk_size=4)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/data.txt",
+        "headers": [(b"range", b"bytes=2-9,-3")],
+        "extensions": {"http.response.zerocopysend": {}} if zero_copy else {},
+    }
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            f = message["file"]
+            f.seek(message["offset"])
+            message = {
+                "type": "http.response.body",
+                "body": f.read(message["count"]),
+                "more_body": message["more_body"],
+            }
+        messages.append(message)
+
+    await app(scope)(None, send)
+
+    start, *body = messages
+    assert start["status"] == 206
+    assert all(message["more_body"] for message in body[:-1])
+    assert not body[-1].get("more_body", False)
+    content = b"".join(bytes(message["body"]) for message in body)
+    assert b"\r\n\r\n23456789\r\n" in content
+    assert b"\r\n\r\n789\r\n" in content
+    assert str(len(content)).encode() in dict(start["headers"]).values()
+
+
+def test_static_files_support_conditional_requests(tmpdir):
+    tmpdir.join("data.txt").write_binary(CONTENT)
+    api = API(static_dir=str(tmpdir))
+    etag = api.client.get("/static/data.txt").headers["etag"]
+    response = api.client.get(
+        "/static/data.txt", headers={"if-none-match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == "max-age=60, public"
@@ -1,3 +1,7 @@
+from functools import wraps
+
+import pytest
+
 from bocadillo import API, hooks
 from .utils import function_hooks, async_function_hooks, class_hooks
 
@@ -115,3 +119,89 @@ def test_before_does_not_run_if_method_not_allowed(api: API):
 
         response = api.client.put("/foo")
         assert response.status_code == 405
+
+
+def test_multiple_hooks_are_called_in_order(api: API):
+    calls = []
+
+    def record(req, res, params, name):
+        calls.append(name)
+
+    @api.route("/foo")
+    @hooks.before(record, "before 1")
+    @hooks.after(record, "after 2")
+    @hooks.before(record, "before 2")
+    @hooks.after(record, "after 1")
+    async def foo(req, res):
+        calls.append("view")
+
+    api.client.get("/foo")
+    assert calls == ["before 1", "before 2", "view", "after 1", "after 2"]
+
+
+def test_before_hook_receives_route_parameters(api: API):
+    received = {}
+
+    async def check(req, res, params):
+        received.update(params)
+
+    @api.route("/greet/{person}")
+    @hooks.before(check)
+    async def greet(req, res, person):
+        res.text = person
+
+    assert api.client.get("/greet/John").text == "John"
+    assert received == {"person": "John"}
+
+
+@pytest.mark.asyncio
+async def test_hooked_handler_can_be_called_directly():
+    with function_hooks() as (before, after):
+
+        @hooks.before(before)
+        @hooks.after(after)
+        async def foo(req, res):
+            pass
+
+        await foo(None, None)
+
+
+def test_decorators_around_and_between_hooks_are_called(api: API):
+    calls = []
+
+    def log(name):
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                calls.append(name)
+                await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def hook(name):
+        async def hook_func(req, res, params):
+            calls.append(name)
+
+        return hook_func
+
+    @api.route("/outside")
+    @log("outer")
+    @hooks.before(hook("hook"))
+    async def outside(req, res):
+        calls.append("view")
+
+    @api.route("/between")
+    @hooks.before(hook("first"))
+    @log("log")
+    @hooks.before(hook("second"))
+    async def between(req, res):
+        calls.append("view")
+
+    api.client.get("/outside")
+    assert calls == ["outer", "hook", "view"]
+
+    calls.clear()
+    api.client.get("/between")
+    assert calls == ["first", "log", "second", "view"]
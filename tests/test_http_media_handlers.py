@@ -1,8 +1,11 @@
+import asyncio
 import json
+from array import array
 
 import pytest
 
 from bocadillo import API, Media
+from bocadillo.response import Response
 from bocadillo.media import UnsupportedMediaType
 
 
@@ -95,3 +98,47 @@ def test_if_media_type_not_supported_then_setting_it_raises_error(api: API):
         API(media_type="application/foo")
 
     assert foo_type in str(ctx.value)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"foo: bar", bytearray(b"foo: bar"), memoryview(b"foo: bar")],
+    ids=["bytes", "bytearray", "memoryview"],
+)
+def test_binary_content_from_media_handler_is_sent_as_is(
+    api: API, foo_type, content
+):
+    api.media_handlers[foo_type] = lambda value: content
+    api.media_type = foo_type
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    @api.route("/")
+    async def index(req, res):
+        res.media = "bar"
+
+    response = api.client.get("/")
+    assert response.content == b"foo: bar"
+    assert response.headers["content-length"] == "8"
+
+    res = Response(None, media=api._media)
+    res.media = "bar"
+    # NOTE: the test client runs its own event loop, so this test is sync.
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(res(None, send))
+    finally:
+        loop.close()
+    assert messages[1]["body"] is content
+
+
+def test_memoryview_content_length_is_in_bytes(api: API):
+    @api.route("/")
+    async def index(req, res):
+        res.content = memoryview(array("i", [1, 2]))
+
+    response = api.client.get("/")
+    assert response.headers["content-length"] == str(len(response.content))
+    assert len(response.content) == 2 * array("i").itemsize
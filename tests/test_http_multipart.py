@@ -0,0 +1,225 @@
+import pytest
+
+from bocadillo import API, HTTPError, view
+from bocadillo.multipart import MultipartParser, parse_options_header
+
+BOUNDARY = "boundary123"
+
+
+def multipart_body(*parts, preamble=b"", epilogue=b"") -> bytes:
+    body = preamble
+    for headers, content in parts:
+        body += f"--{BOUNDARY}\r\n".encode()
+        for name, value in headers.items():
+            body += f"{name}: {value}\r\n".encode()
+        body += b"\r\n" + content + b"\r\n"
+    body += f"--{BOUNDARY}--\r\n".encode() + epilogue
+    return body
+
+
+def field(name: str, value: bytes):
+    return {"Content-Disposition": f'form-data; name="{name}"'}, value
+
+
+def file(name: str, filename: str, content: bytes):
+    return (
+        {
+            "Content-Disposition": (
+                f'form-data; name="{name}"; filename="{filename}"'
+            ),
+            "Content-Type": "application/octet-stream",
+        },
+        content,
+    )
+
+
+HEADERS = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+
+
+async def aiter_chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.fixture
+def multipart_api(api: API):
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        parts = []
+        async for part in req.iter_multipart():
+            parts.append(
+                {
+                    "name": part.name,
+                    "filename": part.filename,
+                    "content_type": part.content_type,
+                    "content": (await part.read()).decode(),
+                }
+            )
+        res.media = parts
+
+    return api
+
+
+def test_parse_options_header():
+    assert parse_options_header(
+        'form-data; name="file"; filename="a \\"b\\".txt"'
+    ) == ("form-data", {"name": "file", "filename": 'a "b".txt'})
+    assert parse_options_header("Multipart/Form-Data; Boundary=abc") == (
+        "multipart/form-data",
+        {"boundary": "abc"},
+    )
+    assert parse_options_header("") == ("", {})
+
+
+def test_fields_and_files(multipart_api: API):
+    body = multipart_body(
+        field("title", b"Hello"), file("doc", "doc.txt", b"line 1\r\nline 2")
+    )
+    response = multipart_api.client.post("/", data=body, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "name": "title",
+            "filename": None,
+            "content_type": None,
+            "content": "Hello",
+        },
+        {
+            "name": "doc",
+            "filename": "doc.txt",
+            "content_type": "application/octet-stream",
+            "content": "line 1\r\nline 2",
+        },
+    ]
+
+
+def test_chunked_body(multipart_api: API):
+    body = multipart_body(field("a", b"x" * 1000), field("b", b"y" * 10))
+
+    def gen():
+        for i in range(0, len(body), 7):
+            yield body[i : i + 7]
+
+    response = multipart_api.client.post("/", data=gen(), headers=HEADERS)
+    assert response.status_code == 200
+    assert [part["content"] for part in response.json()] == [
+        "x" * 1000,
+        "y" * 10,
+    ]
+
+
+def test_preamble_and_epilogue_are_ignored(multipart_api: API):
+    body = multipart_body(
+        field("a", b"1"), preamble=b"ignore me\r\n", epilogue=b"and me"
+    )
+    response = multipart_api.client.post("/", data=body, headers=HEADERS)
+    assert response.status_code == 200
+    assert [part["content"] for part in response.json()] == ["1"]
+
+
+def test_unread_parts_are_skipped(api: API):
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        names = []
+        async for part in req.iter_multipart():
+            names.append(part.name)
+            if part.name == "a":
+                await part.read(3)
+        res.media = names
+
+    body = multipart_body(field("a", b"x" * 100), field("b", b"y" * 100))
+    response = api.client.post("/", data=body, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json() == ["a", "b"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"no boundary here",
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data".encode(),
+        f"--{BOUNDARY}\r\ninvalid\r\n\r\ndata\r\n--{BOUNDARY}--".encode(),
+        f"--{BOUNDARY}\r\n\r\nunterminated".encode(),
+    ],
+)
+def test_malformed_body_returns_400(multipart_api: API, body: bytes):
+    response = multipart_api.client.post("/", data=body, headers=HEADERS)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    [None, "application/json", "multipart/form-data", "text/plain"],
+)
+def test_not_multipart_returns_415(multipart_api: API, content_type):
+    headers = {} if content_type is None else {"content-type": content_type}
+    response = multipart_api.client.post("/", data=b"", headers=headers)
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_parser_handles_tiny_chunks():
+    content = b"\r\n--boundary12 almost a boundary" * 10
+    body = multipart_body(file("f", "f.bin", content), field("g", b""))
+    parser = MultipartParser(
+        aiter_chunks(body, 1), BOUNDARY.encode(), chunk_size=16
+    )
+    parts = []
+    async for part in parser:
+        chunks = [chunk async for chunk in part]
+        assert all(len(chunk) >= 16 for chunk in chunks[:-1])
+        parts.append((part.name, b"".join(chunks)))
+    assert parts == [("f", content), ("g", b"")]
+
+
+@pytest.mark.asyncio
+async def test_malformed_part_raises_while_reading():
+    body = f"--{BOUNDARY}\r\n\r\nunterminated".encode()
+    parser = MultipartParser(aiter_chunks(body, 4), BOUNDARY.encode())
+    async for part in parser:
+        with pytest.raises(HTTPError) as ctx:
+            await part.read()
+        assert ctx.value.status_code == 400
+        break
+
+
+def test_spooled_body_in_memory(api: API):
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        file = await req.spooled_body()
+        assert file is await req.spooled_body()
+        res.media = {"rolled": file._rolled, "size": len(file.read())}
+
+    response = api.client.post("/", data=b"x" * 1000)
+    assert response.json() == {"rolled": False, "size": 1000}
+
+
+def test_spooled_body_rolls_to_disk(api: API, monkeypatch):
+    threaded_writes = []
+
+    async def run_in_threadpool(func, *args):
+        threaded_writes.append(len(args[0]))
+        return func(*args)
+
+    monkeypatch.setattr(
+        "bocadillo.request.run_in_threadpool", run_in_threadpool
+    )
+
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        file = await req.spooled_body(max_memory=100, chunk_size=64)
+        res.media = {"rolled": file._rolled, "size": len(file.read())}
+
+    def gen():
+        for _ in range(10):
+            yield b"x" * 50
+
+    response = api.client.post("/", data=gen())
+    assert response.json() == {"rolled": True, "size": 500}
+    # In-memory writes happen on the event loop, disk writes do not.
+    assert sum(threaded_writes) < 500
+    assert threaded_writes
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from bocadillo import API, Media, hooks, view
+
+
+@pytest.fixture
+def echo_api(api: API):
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        res.media = {"value": await req.media()}
+
+    return api
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    [Media.JSON, f"{Media.JSON}; charset=utf-8", "Application/JSON"],
+)
+def test_decode_json(echo_api: API, content_type):
+    response = echo_api.client.post(
+        "/",
+        data=json.dumps({"foo": "bar"}),
+        headers={"content-type": content_type},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"value": {"foo": "bar"}}
+
+
+def test_decode_text(echo_api: API):
+    response = echo_api.client.post(
+        "/", data="héllo".encode(), headers={"content-type": Media.PLAIN_TEXT}
+    )
+    assert response.json() == {"value": "héllo"}
+
+
+def test_decode_msgpack(echo_api: API):
+    msgpack = pytest.importorskip("msgpack")
+    response = echo_api.client.post(
+        "/",
+        data=msgpack.packb({"foo": "bar"}),
+        headers={"content-type": Media.MSGPACK},
+    )
+    assert response.json() == {"value": {"foo": "bar"}}
+
+
+def test_no_content_type_uses_media_type(echo_api: API):
+    response = echo_api.client.post("/", data=b'{"foo": "bar"}')
+    assert response.json() == {"value": {"foo": "bar"}}
+
+
+def test_unsupported_content_type(echo_api: API):
+    response = echo_api.client.post(
+        "/", data=b"...", headers={"content-type": "application/x-foo"}
+    )
+    assert response.status_code == 415
+
+
+def test_malformed_body(echo_api: API):
+    response = echo_api.client.post(
+        "/", data=b"{", headers={"content-type": Media.JSON}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "module, content_type, data",
+    [
+        ("msgpack", Media.MSGPACK, b"\xc1"),
+        ("msgpack", Media.MSGPACK, b"\x92\x01"),
+        ("cbor2", Media.CBOR, b"\xff\xff"),
+        ("cbor2", Media.CBOR, b"\x82\x01"),
+    ],
+)
+def test_malformed_binary_body(echo_api: API, module, content_type, data):
+    pytest.importorskip(module)
+    response = echo_api.client.post(
+        "/", data=data, headers={"content-type": content_type}
+    )
+    assert response.status_code == 400
+
+
+def test_custom_decoder(echo_api: API):
+    echo_api.media_decoders["application/x-foo"] = lambda data: (
+        data.decode()[::-1]
+    )
+    response = echo_api.client.post(
+        "/", data=b"oof", headers={"content-type": "application/x-foo"}
+    )
+    assert response.json() == {"value": "foo"}
+
+
+def test_body_is_decoded_once(api: API):
+    calls = []
+
+    def decode(data: bytes):
+        calls.append(data)
+        return json.loads(data)
+
+    api.media_decoders[Media.JSON] = decode
+
+    async def validate(req, res, params):
+        assert await req.media() == {"foo": "bar"}
+
+    @api.route("/")
+    @view(methods=["post"])
+    @hooks.before(validate)
+    async def index(req, res):
+        res.media = await req.media()
+
+    response = api.client.post("/", data=b'{"foo": "bar"}')
+    assert response.json() == {"foo": "bar"}
+    assert len(calls) == 1
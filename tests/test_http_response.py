@@ -3,6 +3,7 @@ from asyncio import sleep
 import pytest
 
 from bocadillo import API
+from bocadillo.response import encode_headers
 
 
 def test_if_nothing_set_then_response_is_empty(api: API):
@@ -149,3 +150,52 @@ def test_stream_func_must_be_async_generator_function(api: API):
             @res.stream
             def foo():
                 yield "nope"
+
+
+def test_last_content_attribute_set_wins(api: API):
+    @api.route("/")
+    async def index(req, res):
+        res.text = "foo"
+        res.media = {"foo": "bar"}
+
+    r = api.client.get("/")
+    assert r.json() == {"foo": "bar"}
+    assert r.headers["content-type"] == "application/json"
+
+
+def test_cannot_set_unknown_attribute(api: API):
+    @api.route("/")
+    async def index(req, res):
+        with pytest.raises(AttributeError):
+            res.status = 201
+
+    assert api.client.get("/").status_code == 200
+
+
+def test_content_length_is_set(api: API):
+    @api.route("/")
+    async def index(req, res):
+        res.text = "héllo"
+
+    r = api.client.get("/")
+    assert r.headers["content-length"] == str(len("héllo".encode()))
+
+
+def test_explicit_content_length_is_not_duplicated(api: API):
+    @api.route("/")
+    async def index(req, res):
+        res.content = b"hello"
+        res.headers["Content-Length"] = "5"
+
+    r = api.client.get("/")
+    assert r.raw.headers.getlist("content-length") == ["5"]
+
+
+def test_encode_headers():
+    raw_headers = encode_headers(
+        {"Content-Type": "application/json", "X-Foo": "bar"}
+    )
+    assert raw_headers == [
+        (b"content-type", b"application/json"),
+        (b"x-foo", b"bar"),
+    ]
@@ -68,3 +68,21 @@ def test_use_namespace(api: API):
 
     url = api.url_for("blog:about")
     assert url == "/about"
+
+
+def test_url_for_formats_parameters_according_to_pattern(api: API):
+    @api.route("/items/{pk:d}/{slug:w}")
+    async def item(req, res, pk: int, slug: str):
+        res.text = f"{pk} {slug}"
+
+    url = api.url_for("item", pk="42", slug="foo")
+    assert url == "/items/42/foo"
+    assert api.client.get(url).text == "42 foo"
+
+
+def test_url_for_route_without_parameters(api: API):
+    @api.route("/{{braces}}")
+    async def braces(req, res):
+        pass
+
+    assert api.url_for("braces") == "/{braces}"
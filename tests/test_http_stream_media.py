@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from bocadillo import API, Media
+from bocadillo.response import Response
+
+
+async def numbers(n: int):
+    for i in range(n):
+        yield {"id": i}
+
+
+def test_stream_ndjson(api: API):
+    @api.route("/")
+    async def index(req, res):
+        res.stream_media(numbers(3))
+
+    response = api.client.get("/")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": 0},
+        {"id": 1},
+        {"id": 2},
+    ]
+
+
+@pytest.mark.parametrize("n", [0, 1, 3])
+def test_stream_json_array(api: API, n: int):
+    @api.route("/")
+    async def index(req, res):
+        res.stream_media(numbers(n), format="json-array")
+
+    response = api.client.get("/")
+    assert response.headers["content-type"] == Media.JSON
+    assert response.json() == [{"id": i} for i in range(n)]
+
+
+def test_stream_sync_iterable(api: API):
+    @api.route("/")
+    async def index(req, res):
+        res.stream_media(range(3), format="json-array")
+
+    assert api.client.get("/").json() == [0, 1, 2]
+
+
+def test_unsupported_format(api: API):
+    res = Response(None, media=api._media)
+    with pytest.raises(ValueError):
+        res.stream_media([], format="csv")
+
+
+def test_uses_json_engine():
+    api = API(json_engine=(lambda value: b"%d" % value, None))
+
+    @api.route("/")
+    async def index(req, res):
+        res.stream_media([1, 2])
+
+    assert api.client.get("/").text == "1\n2\n"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 64])
+async def test_items_are_batched(api: API, chunk_size: int):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    res = Response(None, media=api._media)
+    res.stream_media(numbers(100), chunk_size=chunk_size)
+    await res(None, send)
+
+    start, *bodies, end = messages
+    assert start["type"] == "http.response.start"
+    assert end == {"type": "http.response.body", "body": b""}
+    assert all(message["more_body"] for message in bodies)
+    assert all(len(message["body"]) >= chunk_size for message in bodies[:-1])
+    if chunk_size == 1:
+        assert len(bodies) == 100
+    else:
+        assert len(bodies) < 100
+    content = b"".join(message["body"] for message in bodies)
+    assert len(content.splitlines()) == 100
@@ -78,3 +78,31 @@ def test_from_obj(api: API):
 
     api.route("/")(MyView())
     assert api.client.get("/").status_code == 200
+
+
+def test_405_response_has_allow_header(api: API):
+    @api.route("/")
+    class Index:
+        async def get(self, req, res):
+            pass
+
+        async def post(self, req, res):
+            pass
+
+    response = api.client.put("/")
+    assert response.status_code == 405
+    assert response.headers["allow"] == "GET, HEAD, POST"
+
+
+def test_allowed_methods(api: API):
+    @view(methods=["post"])
+    async def create(req, res):
+        pass
+
+    assert create.allowed_methods == {"POST"}
+
+    @view(methods=all)
+    async def anything(req, res):
+        pass
+
+    assert anything.allowed_methods == set(ALL_HTTP_METHODS)
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from bocadillo import API, HTTPError, view
+from bocadillo.error_handlers import error_to_media
+from bocadillo.json_engines import STDLIB, JSONEngine, get_json_engine
+
+
+def dumps(value) -> bytes:
+    return ("custom:" + json.dumps(value)).encode()
+
+
+def loads(value):
+    if isinstance(value, bytes):
+        value = value.decode()
+    return {"custom": json.loads(value)}
+
+
+@pytest.fixture
+def custom_api():
+    return API(json_engine=(dumps, loads))
+
+
+def test_default_engine_is_stdlib():
+    assert get_json_engine() is STDLIB
+    assert get_json_engine("json") is STDLIB
+    assert API().json_engine is STDLIB
+
+
+def test_custom_engine():
+    engine = get_json_engine((dumps, loads))
+    assert engine == JSONEngine("custom", dumps, loads)
+    assert get_json_engine(engine) is engine
+
+
+def test_auto_engine():
+    engine = get_json_engine("auto")
+    assert engine.name in ("orjson", "ujson", "json")
+    assert engine.loads(engine.dumps({"foo": "bar"})) == {"foo": "bar"}
+
+
+def test_third_party_engine():
+    orjson = pytest.importorskip("orjson")
+    engine = get_json_engine("orjson")
+    assert engine.dumps is orjson.dumps
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        get_json_engine("simplejson")
+
+
+def test_media_uses_engine(custom_api: API):
+    @custom_api.route("/")
+    async def index(req, res):
+        res.media = {"foo": "bar"}
+
+    response = custom_api.client.get("/")
+    assert response.text == 'custom:{"foo": "bar"}'
+    assert response.headers["content-length"] == str(len(response.content))
+
+
+def test_error_to_media_uses_engine(custom_api: API):
+    custom_api.add_error_handler(HTTPError, error_to_media)
+
+    @custom_api.route("/")
+    async def index(req, res):
+        raise HTTPError(403)
+
+    response = custom_api.client.get("/")
+    assert response.status_code == 403
+    assert response.text.startswith("custom:")
+
+
+def test_request_json_uses_engine(custom_api: API):
+    @custom_api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        res.text = str(await req.json())
+
+    response = custom_api.client.post("/", data=json.dumps({"foo": "bar"}))
+    assert response.text == str({"custom": {"foo": "bar"}})
+
+
+def test_websocket_json_uses_engine(custom_api: API):
+    @custom_api.websocket_route("/chat", value_type="json")
+    async def chat(ws):
+        async with ws:
+            message = await ws.receive()
+            await ws.send(message)
+
+    with custom_api.client.websocket_connect("/chat") as client:
+        client.send_text(json.dumps("hello"))
+        assert client.receive_text() == 'custom:{"custom": "hello"}'
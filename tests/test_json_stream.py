@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from bocadillo import API, view
+from bocadillo.json_stream import JSONStreamTooLarge, MalformedJSON, iter_json
+
+DOCUMENT = {
+    "meta": {"nested": [1, {"tricky": ']}"\\'}], "text": 'he said "hi"'},
+    "items": [
+        {"id": 1, "name": "é", "tags": ["a", "]"]},
+        2.5e3,
+        True,
+        None,
+        "three",
+        [],
+    ],
+    "count": 6,
+}
+
+
+async def parse(data: bytes, chunk_size: int, **kwargs) -> list:
+    async def chunks():
+        for i in range(0, len(data), chunk_size):
+            yield data[i : i + chunk_size]
+
+    return [value async for value in iter_json(chunks(), **kwargs)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 1024])
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("items.item", DOCUMENT["items"]),
+        ("items.item.id", [1]),
+        ("count", [6]),
+        ("missing.item", []),
+        ("", [DOCUMENT]),
+    ],
+)
+async def test_iter_json(chunk_size: int, path: str, expected: list):
+    data = json.dumps(DOCUMENT).encode()
+    assert await parse(data, chunk_size, path=path) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [b" [ 1 , 2 ] ", b"[1,2]"])
+async def test_top_level_array(data: bytes):
+    assert await parse(data, 1) == [1, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "data", [b"[1, 2", b"[1 2]", b"[1,]", b"[1] x", b'["abc]', b""]
+)
+async def test_malformed(data: bytes):
+    with pytest.raises(MalformedJSON):
+        await parse(data, 2)
+
+
+@pytest.mark.asyncio
+async def test_limit():
+    data = json.dumps(list(range(100))).encode()
+    with pytest.raises(JSONStreamTooLarge):
+        await parse(data, 16, limit=100)
+
+
+@pytest.mark.asyncio
+async def test_max_item_size():
+    data = json.dumps(["a" * 1000]).encode()
+    with pytest.raises(JSONStreamTooLarge):
+        await parse(data, 16, max_item_size=100)
+
+
+@pytest.mark.asyncio
+async def test_skipped_values_are_not_buffered():
+    data = json.dumps({"blob": "a" * 1000, "items": [1]}).encode()
+    assert await parse(data, 16, path="items.item", max_item_size=100) == [1]
+
+
+@pytest.fixture
+def upload_api(api: API):
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        res.media = [item async for item in req.iter_json("items.item")]
+
+    return api
+
+
+def test_request_iter_json(upload_api: API):
+    response = upload_api.client.post("/", data=json.dumps(DOCUMENT))
+    assert response.status_code == 200
+    assert response.json() == DOCUMENT["items"]
+
+
+def test_request_iter_json_malformed(upload_api: API):
+    response = upload_api.client.post("/", data=b'{"items": [1,')
+    assert response.status_code == 400
+
+
+def test_request_iter_json_limit(api: API):
+    @api.route("/")
+    @view(methods=["post"])
+    async def index(req, res):
+        async for _ in req.iter_json(limit=10):
+            pass
+
+    response = api.client.post("/", data=json.dumps(list(range(10))))
+    assert response.status_code == 413
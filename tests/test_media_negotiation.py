@@ -0,0 +1,152 @@
+import pytest
+
+from bocadillo import API, Media
+from bocadillo.media import parse_accept
+
+
+@pytest.fixture
+def negotiating_api():
+    api = API(media_negotiation=True)
+
+    @api.route("/")
+    async def index(req, res):
+        res.media = {"message": "hello"}
+
+    return api
+
+
+def test_msgpack_handler(api: API):
+    msgpack = pytest.importorskip("msgpack")
+    api.media_type = Media.MSGPACK
+
+    @api.route("/")
+    async def index(req, res):
+        res.media = {"message": "hello"}
+
+    response = api.client.get("/")
+    assert response.headers["content-type"] == Media.MSGPACK
+    assert msgpack.unpackb(response.content) == {"message": "hello"}
+
+
+def test_cbor_handler(api: API):
+    cbor2 = pytest.importorskip("cbor2")
+    api.media_type = Media.CBOR
+
+    @api.route("/")
+    async def index(req, res):
+        res.media = {"message": "hello"}
+
+    response = api.client.get("/")
+    assert response.headers["content-type"] == Media.CBOR
+    assert cbor2.loads(response.content) == {"message": "hello"}
+
+
+def test_negotiation_is_disabled_by_default(api: API):
+    @api.route("/")
+    async def index(req, res):
+        res.media = {"message": "hello"}
+
+    response = api.client.get("/", headers={"accept": "text/html"})
+    assert response.headers["content-type"] == Media.JSON
+    assert "vary" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, Media.JSON),
+        ("*/*", Media.JSON),
+        ("text/html", Media.JSON),
+        ("text/*", Media.JSON),
+        ("text/html;q=0.5, text/plain", Media.JSON),
+        ("text/html, application/json;q=0.1", Media.JSON),
+        (
+            "text/html,application/xhtml+xml,application/xml;q=0.9,"
+            "*/*;q=0.8",
+            Media.JSON,
+        ),
+        ("image/png", Media.JSON),
+    ],
+)
+def test_negotiate_media_type_from_accept_header(
+    negotiating_api: API, accept, expected
+):
+    headers = {} if accept is None else {"accept": accept}
+    response = negotiating_api.client.get("/", headers=headers)
+    assert response.headers["content-type"] == expected
+    assert response.headers["vary"] == "Accept"
+
+
+def test_negotiate_binary_media_type(negotiating_api: API):
+    msgpack = pytest.importorskip("msgpack")
+    response = negotiating_api.client.get(
+        "/", headers={"accept": "application/msgpack, application/json;q=0.9"}
+    )
+    assert response.headers["content-type"] == Media.MSGPACK
+    assert msgpack.unpackb(response.content) == {"message": "hello"}
+
+
+def test_negotiation_is_cached_per_accept_header():
+    media = Media(Media.JSON, negotiation=True)
+    assert media.negotiate("application/cbor") == Media.CBOR
+    assert media.negotiate("application/cbor") == Media.CBOR
+    info = media._negotiate.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_negotiation_cache_is_invalidated():
+    media = Media(Media.JSON, negotiation=True)
+    media.negotiable.add("application/foo")
+    assert media.negotiate("application/foo") == Media.JSON
+
+    media.handlers = {**media.handlers, "application/foo": str}
+    assert media.negotiate("application/foo") == "application/foo"
+
+    media.handlers.pop("application/foo")
+    assert media.negotiate("application/foo") == Media.JSON
+
+    media.handlers["application/foo"] = str
+    assert media.negotiate("application/foo") == "application/foo"
+
+
+def test_media_handlers_can_be_changed_in_place(negotiating_api: API):
+    headers = {"accept": "application/foo"}
+    response = negotiating_api.client.get("/", headers=headers)
+    assert response.headers["content-type"] == Media.JSON
+
+    negotiating_api.media_handlers["application/foo"] = str
+    response = negotiating_api.client.get("/", headers=headers)
+    assert response.headers["content-type"] == Media.JSON
+
+    negotiating_api.negotiable_media_types.add("application/foo")
+    response = negotiating_api.client.get("/", headers=headers)
+    assert response.headers["content-type"] == "application/foo"
+
+
+def test_configured_media_type_is_negotiable(negotiating_api: API):
+    negotiating_api.media_type = Media.PLAIN_TEXT
+    response = negotiating_api.client.get(
+        "/", headers={"accept": "text/plain, application/json;q=0.5"}
+    )
+    assert response.headers["content-type"] == Media.PLAIN_TEXT
+    response = negotiating_api.client.get("/", headers={"accept": "text/html"})
+    assert response.headers["content-type"] == Media.PLAIN_TEXT
+
+
+def test_vary_header_is_extended(negotiating_api: API):
+    @negotiating_api.route("/vary")
+    async def index(req, res):
+        res.headers["Vary"] = "Accept-Encoding"
+        res.media = {"message": "hello"}
+        res.media = {"message": "hello"}
+
+    response = negotiating_api.client.get("/vary")
+    assert response.headers["vary"] == "Accept-Encoding, Accept"
+
+
+def test_parse_accept():
+    assert parse_accept("text/html;level=1;q=0.5, */*;q=0.1, Text/Plain") == [
+        "text/plain",
+        "text/html",
+        "*/*",
+    ]
@@ -1 +1,82 @@
-# TODO
+import pytest
+
+from bocadillo import API
+from bocadillo.routing import MountRouter
+
+
+def _asgi_app(name: str):
+    def app(scope):
+        async def asgi(receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [[b"content-type", b"text/plain"]],
+                }
+            )
+            body = f"{name}:{scope['path']}".encode()
+            await send({"type": "http.response.body", "body": body})
+
+        return asgi
+
+    return app
+
+
+def test_mount_asgi_app(api: API):
+    api.mount("/foo", _asgi_app("foo"))
+
+    response = api.client.get("/foo/bar")
+    assert response.status_code == 200
+    assert response.text == "foo:/bar"
+
+
+def test_prefix_only_matches_whole_segments(api: API):
+    api.mount("/static", _asgi_app("static"))
+
+    @api.route("/staticfiles")
+    async def staticfiles(req, res):
+        res.text = "api"
+
+    assert api.client.get("/staticfiles").text == "api"
+    assert api.client.get("/static").text == "static:"
+
+
+def test_longest_prefix_wins(api: API):
+    api.mount("/foo/bar", _asgi_app("bar"))
+    api.mount("/foo", _asgi_app("foo"))
+
+    assert api.client.get("/foo/bar/baz").text == "bar:/baz"
+    assert api.client.get("/foo/baz").text == "foo:/baz"
+
+
+def test_mount_router():
+    router = MountRouter()
+    assert router.match("/foo") is None
+
+    router.add("/foo/", "foo")
+    assert router.match("/foo/bar") == ("/foo", "foo")
+    assert router.match("/foobar") is None
+
+    # Cache is cleared when an app is mounted.
+    router.add("/", "root")
+    assert router.match("/foobar") == ("", "root")
+
+
+def test_mount_router_caches_by_prefix():
+    router = MountRouter()
+    router.add("/static", "static")
+    for name in ("a.css", "b.css", "c/d.css"):
+        assert router.match(f"/static/{name}") == ("/static", "static")
+    assert router._cached_match.cache_info().currsize == 1
+
+    router.add("/static/c", "c")
+    assert router.match("/static/c/d.css") == ("/static/c", "c")
+    assert router.match("/static/a.css") == ("/static", "static")
+
+
+def test_apps_are_read_only(api: API):
+    app = _asgi_app("foo")
+    api.mount("/foo", app)
+    assert api.apps["/foo"] is app
+    with pytest.raises(TypeError):
+        api.apps["/bar"] = app
@@ -0,0 +1,231 @@
+import pytest
+
+from bocadillo import API
+from bocadillo.routing import HTTPRouter, get_engine
+
+ENGINES = ["linear", "regex", "trie"]
+
+
+@pytest.fixture(params=ENGINES)
+def engine(request) -> str:
+    return request.param
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        get_engine("foo")
+
+
+def test_match_with_parameters(engine: str):
+    api = API(routing_engine=engine)
+
+    @api.route("/add/{x:d}/{y:d}")
+    async def add(req, res, x: int, y: int):
+        res.text = str(x + y)
+
+    response = api.client.get("/add/1/2")
+    assert response.status_code == 200
+    assert response.text == "3"
+    assert api.client.get("/add/1/foo").status_code == 404
+
+
+def test_first_registered_route_wins(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def first(req, res, slug):
+        pass
+
+    async def second(req, res):
+        pass
+
+    router.add_route(first, "/posts/{slug}")
+    router.add_route(second, "/posts/latest")
+
+    match = router.match("/posts/latest")
+    assert match.route._name == "first"
+    assert match.params == {"slug": "latest"}
+
+
+def test_static_route_registered_first_wins(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def latest(req, res):
+        pass
+
+    async def post(req, res, slug):
+        pass
+
+    router.add_route(latest, "/posts/latest")
+    router.add_route(post, "/posts/{slug}")
+
+    match = router.match("/posts/latest")
+    assert match.route._name == "latest"
+    assert match.params == {}
+    assert router.match("/posts/LATEST").route._name == "latest"
+    assert router.match("/posts/hello").route._name == "post"
+
+
+def test_routes_added_after_first_match_are_matched(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def foo(req, res):
+        pass
+
+    async def bar(req, res):
+        pass
+
+    router.add_route(foo, "/foo")
+    assert router.match("/bar") is None
+
+    router.add_route(bar, "/bar")
+    assert router.match("/bar").route._name == "bar"
+
+
+def test_parameter_names_can_be_shared_across_routes(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def user(req, res, pk):
+        pass
+
+    async def post(req, res, pk):
+        pass
+
+    router.add_route(user, "/users/{pk:d}")
+    router.add_route(post, "/posts/{pk:d}")
+
+    match = router.match("/posts/2")
+    assert match.route._name == "post"
+    assert match.params == {"pk": 2}
+
+
+def test_repeated_parameter_must_have_same_value(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def same(req, res, x):
+        pass
+
+    router.add_route(same, "/{x}/{x}")
+
+    assert router.match("/a/a").params == {"x": "a"}
+    assert router.match("/a/b") is None
+
+
+def test_no_routes(engine: str):
+    assert HTTPRouter(engine=engine).match("/") is None
+
+
+def test_websocket_routing(engine: str):
+    api = API(routing_engine=engine)
+
+    @api.websocket_route("/chat/{room}")
+    async def chat(ws, room):
+        async with ws:
+            await ws.send(room)
+
+    with api.client.websocket_connect("/chat/general") as client:
+        assert client.receive_text() == "general"
+
+
+def test_static_segments_are_case_insensitive(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def orders(req, res, pk):
+        pass
+
+    router.add_route(orders, "/api/Orders/{pk:d}")
+
+    assert router.match("/API/orders/1").params == {"pk": 1}
+
+
+def test_parameter_may_span_multiple_segments(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def files(req, res, path):
+        pass
+
+    router.add_route(files, "/files/{path}")
+
+    assert router.match("/files/a/b.txt").params == {"path": "a/b.txt"}
+
+
+def test_router_stats(engine: str):
+    router = HTTPRouter(engine=engine)
+
+    async def orders(req, res):
+        pass
+
+    router.add_route(orders, "/api/v2/orders")
+
+    stats = router.stats()
+    assert stats["engine"] == engine
+    assert stats["routes"] == 1
+
+
+def test_trie_stats():
+    router = HTTPRouter(engine="trie")
+
+    async def orders(req, res):
+        pass
+
+    async def order(req, res, pk):
+        pass
+
+    router.add_route(orders, "/api/v2/orders")
+    router.add_route(order, "/api/v2/orders/{pk:d}")
+
+    # Nodes: root, "", "api", "v2", "orders".
+    assert router.stats() == {
+        "engine": "trie",
+        "routes": 2,
+        "nodes": 5,
+        "depth": 4,
+    }
+
+
+def test_match_cache(engine: str):
+    router = HTTPRouter(engine=engine, cache_size=2)
+
+    async def product(req, res, pk):
+        pass
+
+    router.add_route(product, "/products/{pk:d}")
+
+    first = router.match("/products/42")
+    first.params["pk"] = 0
+    second = router.match("/products/42")
+    assert second.route is first.route
+    assert second.params == {"pk": 42}
+
+    assert router.stats()["cache"] == {
+        "hits": 1,
+        "misses": 1,
+        "size": 1,
+        "maxsize": 2,
+    }
+
+
+def test_match_cache_is_cleared_when_route_is_added(engine: str):
+    router = HTTPRouter(engine=engine, cache_size=16)
+
+    async def foo(req, res):
+        pass
+
+    assert router.match("/foo") is None
+    router.add_route(foo, "/foo")
+    assert router.match("/foo") is not None
+
+
+def test_route_cache_size_is_passed_to_routers():
+    api = API(route_cache_size=16)
+
+    @api.route("/greet/{person}")
+    async def greet(req, res, person):
+        res.text = person
+
+    for _ in range(2):
+        assert api.client.get("/greet/John").text == "John"
+
+    cache = api.http_router.stats()["cache"]
+    assert cache["hits"] == 1
+    assert cache["maxsize"] == 16
+    assert api.websocket_router.stats()["cache"]["maxsize"] == 16
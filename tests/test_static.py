@@ -1,6 +1,10 @@
+import gzip
+import os
+
 import pytest
 
 from bocadillo import API, static
+from bocadillo.staticfiles import brotli, compress
 
 FILE_DIR = "js"
 FILE_NAME = "foo.js"
@@ -75,3 +79,320 @@ def test_if_static_dir_does_not_exist_then_no_files_mounted():
     with pytest.warns(None) as record:
         API(static_dir="foo")
     assert len(record) == 0
+
+
+@pytest.fixture
+def static_app(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    _create_asset(static_dir)
+    return static(str(static_dir), chunk_size=16)
+
+
+async def call(
+    app, path: str, method: str = "GET", extensions=None, headers=None
+) -> list:
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [
+            (name.encode(), value.encode())
+            for name, value in (headers or {}).items()
+        ],
+    }
+    if extensions is not None:
+        scope["extensions"] = extensions
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        if "file" in message:
+            message["content"] = message["file"].read()
+        messages.append(message)
+
+    await app(scope)(receive, send)
+    return messages
+
+
+def test_file_headers(static_app):
+    api = API(static_dir=None)
+    api.mount("static", static_app)
+    response = api.client.get(f"/static/{FILE_DIR}/{FILE_NAME}")
+    assert response.status_code == 200
+    assert "javascript" in response.headers["content-type"]
+    assert response.headers["content-length"] == str(len(FILE_CONTENTS))
+    assert response.headers["etag"]
+    assert response.headers["last-modified"].endswith("GMT")
+    assert response.headers["cache-control"] == "max-age=60, public"
+
+
+def test_head_request(static_app):
+    api = API(static_dir=None)
+    api.mount("static", static_app)
+    response = api.client.head(f"/static/{FILE_DIR}/{FILE_NAME}")
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(FILE_CONTENTS))
+    assert response.text == ""
+
+
+def test_unsupported_method_returns_405(static_app):
+    api = API(static_dir=None)
+    api.mount("static", static_app)
+    response = api.client.post(f"/static/{FILE_DIR}/{FILE_NAME}")
+    assert response.status_code == 405
+    assert response.headers["allow"] == "GET, HEAD"
+
+
+@pytest.mark.asyncio
+async def test_files_outside_of_directory_are_not_served(static_app):
+    path = f"/{FILE_DIR}/../{FILE_DIR}/{FILE_NAME}"
+    start, _ = await call(static_app, path)
+    assert start["status"] == 404
+
+
+def test_files_are_indexed_on_creation(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    app = static(str(static_dir))
+    asset = _create_asset(static_dir)
+    assert app.files == {}
+    app.build_index()
+    assert list(app.files) == [f"/{FILE_DIR}/{FILE_NAME}"]
+    assert app.files[f"/{FILE_DIR}/{FILE_NAME}"].path == str(asset)
+
+
+@pytest.mark.asyncio
+async def test_large_files_are_sent_in_chunks(static_app):
+    start, *chunks = await call(static_app, f"/{FILE_DIR}/{FILE_NAME}")
+    assert start["status"] == 200
+    assert [len(chunk["body"]) for chunk in chunks] == [16, 4]
+    assert [chunk["more_body"] for chunk in chunks] == [True, False]
+    assert b"".join(chunk["body"] for chunk in chunks) == FILE_CONTENTS.encode()
+
+
+@pytest.mark.asyncio
+async def test_zero_copy_send_is_used_if_supported(static_app):
+    start, message = await call(
+        static_app,
+        f"/{FILE_DIR}/{FILE_NAME}",
+        extensions={"http.response.zerocopysend": {}},
+    )
+    assert start["status"] == 200
+    assert message["type"] == "http.response.zerocopysend"
+    assert message["count"] == len(FILE_CONTENTS)
+    assert message["content"] == FILE_CONTENTS.encode()
+
+
+@pytest.fixture
+def compressed_app(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    _create_asset(static_dir)
+    js_dir = static_dir.join(FILE_DIR)
+    js_dir.join(FILE_NAME + ".gz").write_binary(b"gzipped")
+    js_dir.join(FILE_NAME + ".br").write_binary(b"brotli")
+    api = API(static_dir=None)
+    api.mount("static", static(str(static_dir)))
+    return api
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, content_encoding, content",
+    [
+        (None, None, FILE_CONTENTS),
+        ("identity", None, FILE_CONTENTS),
+        ("gzip", "gzip", "gzipped"),
+        ("gzip, br", "br", "brotli"),
+        ("gzip, br;q=0", "gzip", "gzipped"),
+        ("*", "br", "brotli"),
+        ("*, br;q=0", "gzip", "gzipped"),
+    ],
+)
+def test_precompressed_variant_is_selected(
+    compressed_app, accept_encoding, content_encoding, content
+):
+    headers = {"accept-encoding": accept_encoding or ""}
+    response = compressed_app.client.get(
+        f"/static/{FILE_DIR}/{FILE_NAME}", headers=headers, stream=True
+    )
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == content_encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert "javascript" in response.headers["content-type"]
+    assert response.headers["content-length"] == str(len(content))
+    assert response.raw.read(decode_content=False) == content.encode()
+
+
+def test_precompressed_file_requested_directly(compressed_app):
+    response = compressed_app.client.get(
+        f"/static/{FILE_DIR}/{FILE_NAME}.gz",
+        headers={"accept-encoding": ""},
+        stream=True,
+    )
+    assert response.headers["content-type"] == "application/gzip"
+    assert "content-encoding" not in response.headers
+    assert response.raw.read(decode_content=False) == b"gzipped"
+
+
+def test_no_vary_header_without_variants(static_app):
+    api = API(static_dir=None)
+    api.mount("static", static_app)
+    response = api.client.get(f"/static/{FILE_DIR}/{FILE_NAME}")
+    assert "vary" not in response.headers
+
+
+def test_compress(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    static_dir.join("app.js").write("console.log('foo');\n" * 100)
+    static_dir.join("small.css").write("h1 {}")
+    static_dir.join("logo.png").write_binary(b"\x00" * 1000)
+
+    paths = compress(str(static_dir))
+
+    expected = {"app.js.gz"}
+    if brotli is not None:
+        expected.add("app.js.br")
+    assert {os.path.basename(path) for path in paths} == expected
+    assert gzip.decompress(static_dir.join("app.js.gz").read_binary()) == (
+        static_dir.join("app.js").read_binary()
+    )
+    # Output is reproducible: the gzip header does not embed the mtime.
+    gz = static_dir.join("app.js.gz").read_binary()
+    assert gz[4:8] == b"\x00\x00\x00\x00"
+    compress(str(static_dir))
+    assert static_dir.join("app.js.gz").read_binary() == gz
+
+
+URL = f"/{FILE_DIR}/{FILE_NAME}"
+
+
+@pytest.fixture
+def cached_app(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    asset = _create_asset(static_dir)
+    app = static(str(static_dir), cache_size=1024)
+    app.asset = asset
+    return app
+
+
+@pytest.mark.asyncio
+async def test_cached_files_are_served_without_io(cached_app, monkeypatch):
+    start, body = await call(cached_app, URL)
+    assert body["body"] == FILE_CONTENTS.encode()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("File should not be opened")
+
+    monkeypatch.setattr("builtins.open", fail)
+    start, body = await call(cached_app, URL)
+    assert start["status"] == 200
+    assert (b"etag", cached_app.files[URL].etag.encode()) in (start["headers"])
+    assert body["body"] == FILE_CONTENTS.encode()
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_by_size(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    for name in "abc":
+        static_dir.join(f"{name}.txt").write(name * 40)
+    app = static(str(static_dir), cache_size=100)
+
+    for name in "abca":
+        await call(app, f"/{name}.txt")
+
+    assert list(app._cache) == [
+        str(static_dir.join("c.txt")),
+        str(static_dir.join("a.txt")),
+    ]
+    assert app._cached_bytes == 80
+
+
+@pytest.mark.asyncio
+async def test_files_larger_than_cache_are_not_cached(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    static_dir.join("big.txt").write("x" * 200)
+    app = static(str(static_dir), cache_size=100)
+    start, body = await call(app, "/big.txt")
+    assert body["body"] == b"x" * 200
+    assert not app._cache
+
+
+@pytest.mark.asyncio
+async def test_modified_files_are_served_from_cache_if_not_debug(cached_app):
+    await call(cached_app, URL)
+    cached_app.asset.write("modified")
+    _, body = await call(cached_app, URL)
+    assert body["body"] == FILE_CONTENTS.encode()
+
+
+@pytest.mark.asyncio
+async def test_modified_files_are_refreshed_in_debug_mode(cached_app):
+    cached_app.debug = True
+    await call(cached_app, URL)
+    etag = cached_app.files[URL].etag
+
+    cached_app.asset.write("modified!")
+    os.utime(str(cached_app.asset), (0, 0))
+
+    start, body = await call(cached_app, URL)
+    assert body["body"] == b"modified!"
+    assert (b"content-length", b"9") in start["headers"]
+    assert cached_app.files[URL].etag != etag
+
+
+@pytest.mark.asyncio
+async def test_deleted_files_are_not_served_in_debug_mode(cached_app):
+    cached_app.debug = True
+    await call(cached_app, URL)
+    cached_app.asset.remove()
+    start, _ = await call(cached_app, URL)
+    assert start["status"] == 404
+    assert not cached_app._cache
+
+
+def test_debug_mode_is_propagated_to_static_apps(tmpdir_factory):
+    static_dir = tmpdir_factory.mktemp("static")
+    api = API(static_dir=str(static_dir), static_config={"cache_size": 100})
+    app = api.apps["/static"]
+    assert app.cache_size == 100
+    assert not app.debug
+    api.debug = True
+    assert app.debug
+
+    other = static(str(static_dir))
+    api.mount("/other", other)
+    assert other.debug
+
+
+@pytest.mark.asyncio
+async def test_cache_misses_are_read_in_threadpool(cached_app, monkeypatch):
+    calls = []
+
+    async def run_in_threadpool(func, *args):
+        calls.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(
+        "bocadillo.staticfiles.run_in_threadpool", run_in_threadpool
+    )
+    await call(cached_app, URL)
+    await call(cached_app, URL)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_small_files_are_read_in_threadpool(tmpdir, monkeypatch):
+    tmpdir.join("app.css").write("h1 {}")
+    app = static(str(tmpdir))
+    calls = []
+
+    async def run_in_threadpool(func, *args):
+        calls.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr(
+        "bocadillo.staticfiles.run_in_threadpool", run_in_threadpool
+    )
+    _, body = await call(app, "/app.css")
+    assert body["body"] == b"h1 {}"
+    assert calls == ["open", "_read_at"]